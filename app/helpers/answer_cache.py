@@ -0,0 +1,117 @@
+import collections
+import threading
+
+import numpy as np
+import sqlalchemy as _sql
+
+import app.local_database.models as _models
+from app.helpers.constants import ANSWER_CACHE_THRESHOLD, ANSWER_CACHE_MAX_PER_MEETING
+
+
+class AnswerCache:
+    """
+    Per-meeting cache of Q&A answers, looked up by question embedding.
+
+    A question whose embedding has cosine similarity of at least `threshold`
+    with a stored question gets the stored answer, skipping retrieval and
+    generation. Each meeting's entries are tagged with an index version (the id
+    of the upload job that last indexed the transcript), so a lookup made after
+    a re-ingest, in any process, drops the stale entries. The delete and ingest
+    paths also call `invalidate()` directly to free memory.
+    """
+
+    def __init__(self, threshold: float, max_per_meeting: int):
+        self.threshold = threshold
+        self.max_per_meeting = max_per_meeting
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self._meetings = {}  # meeting id -> (index version, OrderedDict of entries)
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _unit_vector(embedding):
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _entries(self, meeting_id: str, version):
+        """Entries for a meeting at `version`, discarding older ones. Caller holds the lock."""
+        cached = self._meetings.get(meeting_id)
+        if cached is None or cached[0] != version:
+            cached = (version, collections.OrderedDict())
+            self._meetings[meeting_id] = cached
+        return cached[1]
+
+    def get(self, meeting_id, version, embedding):
+        """Returns the stored answer for the most similar question above the threshold, or None."""
+        if self.threshold <= 0 or not embedding:
+            return None
+        query = self._unit_vector(embedding)
+        if query is None:
+            return None
+
+        with self._lock:
+            entries = self._entries(str(meeting_id), version)
+            best_key, best_score = None, self.threshold
+            if entries:
+                keys = list(entries)
+                vectors = np.stack([entries[key]["vector"] for key in keys])
+                scores = vectors @ query if vectors.shape[1] == query.shape[0] else np.zeros(len(keys))
+                index = int(scores.argmax())
+                if scores[index] >= best_score:
+                    best_key, best_score = keys[index], float(scores[index])
+
+            if best_key is None:
+                self.misses += 1
+                return None
+
+            entries.move_to_end(best_key)
+            entry = entries[best_key]
+            self.hits += 1
+            self.seconds_saved += entry["seconds"]
+            return {"question": entry["question"], "answer": entry["answer"], "similarity": round(best_score, 4)}
+
+    def put(self, meeting_id, version, embedding, question: str, answer: str, seconds: float):
+        """Stores an answer with the time retrieval and generation took to produce it."""
+        if self.threshold <= 0 or not embedding:
+            return
+        vector = self._unit_vector(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            entries = self._entries(str(meeting_id), version)
+            self._next_id += 1
+            entries[self._next_id] = {"vector": vector, "question": question, "answer": answer, "seconds": seconds}
+            while len(entries) > self.max_per_meeting:
+                entries.popitem(last=False)
+
+    def invalidate(self, meeting_id):
+        with self._lock:
+            self._meetings.pop(str(meeting_id), None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "latency_saved_seconds": round(self.seconds_saved, 2),
+                "meetings": len(self._meetings),
+                "entries": sum(len(entries) for _, entries in self._meetings.values()),
+                "threshold": self.threshold,
+            }
+
+
+answer_cache = AnswerCache(ANSWER_CACHE_THRESHOLD, ANSWER_CACHE_MAX_PER_MEETING)
+
+
+def index_version(db, meeting_id):
+    """Id of the upload job that last indexed the meeting's transcript (None if never indexed)."""
+    return db.query(_sql.func.max(_models.UploadJob.id)).filter(
+        _models.UploadJob.meeting_id == meeting_id,
+        _models.UploadJob.stage == "indexed",
+    ).scalar()
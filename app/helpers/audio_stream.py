@@ -0,0 +1,108 @@
+import functools
+import os
+import subprocess
+import tempfile
+
+import numpy as np
+import soundfile as sf
+import torch
+import torchaudio
+
+from app.helpers.constants import AUDIO_BLOCK_SECONDS
+
+TARGET_SAMPLE_RATE = 16000
+
+
+@functools.lru_cache(maxsize=8)
+def get_resampler(orig_freq: int):
+    """Resample transform to 16 kHz, built once per source rate."""
+    return torchaudio.transforms.Resample(orig_freq=orig_freq, new_freq=TARGET_SAMPLE_RATE)
+
+
+def iter_audio_blocks(file_path: str, block_seconds: float = AUDIO_BLOCK_SECONDS):
+    """
+    Decodes an audio file block by block as 16 kHz mono float32 arrays.
+
+    Only one block of source frames is held at a time, so memory use does not
+    depend on the recording length. MP3 goes through ffmpeg, since libsndfile
+    only reads it from version 1.1 on.
+    """
+    if file_path.lower().endswith(".mp3"):
+        yield from iter_ffmpeg_pcm_blocks(file_path, block_seconds)
+        return
+
+    with sf.SoundFile(file_path) as audio:
+        src_rate = audio.samplerate
+        resampler = get_resampler(src_rate) if src_rate != TARGET_SAMPLE_RATE else None
+
+        for block in audio.blocks(blocksize=int(src_rate * block_seconds), dtype="float32", always_2d=True):
+            # (frames, channels) -> mono (frames,)
+            mono = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+            if resampler is not None:
+                with torch.no_grad():
+                    mono = resampler(torch.from_numpy(np.ascontiguousarray(mono))).numpy()
+            yield mono.astype(np.float32, copy=False)
+
+
+def ffmpeg_executable() -> str:
+    """ffmpeg binary bundled with imageio-ffmpeg, or the one on PATH."""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
+
+
+def iter_ffmpeg_pcm_blocks(file_path: str, block_seconds: float = AUDIO_BLOCK_SECONDS):
+    """
+    Decodes the audio track of any ffmpeg-readable file (e.g. mp4) block by block.
+
+    ffmpeg downmixes and resamples to 16 kHz mono float32 PCM and writes it to a
+    pipe, so no intermediate audio file is ever written to disk.
+    """
+    cmd = [
+        ffmpeg_executable(), "-nostdin", "-loglevel", "error",
+        "-i", file_path,
+        "-vn", "-ac", "1", "-ar", str(TARGET_SAMPLE_RATE),
+        "-f", "f32le", "pipe:1",
+    ]
+    block_bytes = int(TARGET_SAMPLE_RATE * block_seconds) * 4
+    # stderr goes to a file, not a pipe: an unread pipe that fills up would
+    # block ffmpeg while we are blocked reading stdout
+    stderr_file = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+
+    try:
+        while True:
+            data = proc.stdout.read(block_bytes)
+            if not data:
+                break
+            yield np.frombuffer(data[:len(data) - len(data) % 4], dtype=np.float32)
+
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed to decode audio from {file_path}: {_stderr_tail(stderr_file)}")
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        stderr_file.close()
+
+
+def _stderr_tail(stderr_file, max_bytes: int = 4096) -> str:
+    """Last `max_bytes` of what ffmpeg wrote to stderr."""
+    size = stderr_file.seek(0, os.SEEK_END)
+    stderr_file.seek(max(0, size - max_bytes))
+    return stderr_file.read().decode("utf-8", errors="replace").strip()
+
+
+def iter_fixed_windows(blocks, max_samples: int):
+    """Regroups a block stream into consecutive windows of `max_samples` samples."""
+    buffer = np.empty(0, dtype=np.float32)
+    for block in blocks:
+        buffer = np.concatenate((buffer, block))
+        while len(buffer) >= max_samples:
+            yield buffer[:max_samples]
+            buffer = buffer[max_samples:]
+    if len(buffer):
+        yield buffer
@@ -1,4 +1,4 @@
-
+import os
 
 DATAPREP_URL = "http://localhost:6007/v1/dataprep/ingest"
 UPLOAD_DIR = "uploaded_files" 
@@ -6,4 +6,89 @@ RETRIVER_URL = "http://localhost:6008/v1/retrieval"
 EMBEDDING_URL="http://localhost:8090/embed"
 OLLAMA_URL = "http://localhost:11434/api/generate"
 
+# Upstream HTTP clients
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))  # seconds
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))  # pooled keep-alive connections per upstream
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))  # extra attempts on connection errors / 502-504
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.5"))  # seconds, doubled per attempt
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))  # consecutive failures before failing fast, 0 = off
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))  # seconds before a trial call is let through
+EMBEDDING_TIMEOUT = float(os.getenv("EMBEDDING_TIMEOUT", "30"))
+RETRIEVER_TIMEOUT = float(os.getenv("RETRIEVER_TIMEOUT", "30"))
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "300"))  # also the longest gap between streamed tokens
+DATAPREP_TIMEOUT = float(os.getenv("DATAPREP_TIMEOUT", "300"))
+
+# Models
+WHISPER_MODEL_ID = "openai/whisper-tiny"
+SUMMARIZER_MODEL_ID = "facebook/bart-large-cnn"
+SENTIMENT_MODEL_ID = "tabularisai/multilingual-sentiment-analysis"
+INFERENCE_PRECISION = os.getenv("INFERENCE_PRECISION", "fp32")  # fp32, int8 (dynamic quantization) or bf16
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() in ("1", "true", "yes")  # load models in the background at startup
+MODEL_IDLE_TIMEOUT = float(os.getenv("MODEL_IDLE_TIMEOUT", "0"))  # seconds before an unused model is unloaded, 0 = never
+MODEL_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "0"))  # resident model budget, 0 = unlimited
+
+# Whisper decoding
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))  # 30 s chunks per generate() call
+AUDIO_BLOCK_SECONDS = float(os.getenv("AUDIO_BLOCK_SECONDS", "10"))  # decode granularity for streamed audio
+
+# Summarization
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "4"))  # chunks per BART pipeline call
+SUMMARY_MAX_INPUT_TOKENS = int(os.getenv("SUMMARY_MAX_INPUT_TOKENS", "1024"))  # capped at the model's input limit
+SUMMARY_HIERARCHICAL = os.getenv("SUMMARY_HIERARCHICAL", "true").lower() in ("1", "true", "yes")  # map-reduce for long transcripts
+SUMMARY_TARGET_TOKENS = int(os.getenv("SUMMARY_TARGET_TOKENS", "512"))  # reduce until the summary fits this length
+SUMMARY_MAP_WORKERS = int(os.getenv("SUMMARY_MAP_WORKERS", "2"))  # chunk slices summarized in parallel
+SUMMARY_MAX_REDUCE_ROUNDS = int(os.getenv("SUMMARY_MAX_REDUCE_ROUNDS", "4"))
+
+# Meeting minutes
+MINUTES_SEGMENT_CHARS = int(os.getenv("MINUTES_SEGMENT_CHARS", "6000"))  # longer transcripts use chunked map-reduce minutes
+MINUTES_CONCURRENCY = int(os.getenv("MINUTES_CONCURRENCY", "3"))  # segment requests sent to Ollama at once
+
+# Multi-turn meeting chat
+CHAT_NUM_CTX = int(os.getenv("CHAT_NUM_CTX", "4096"))  # Ollama context window (options.num_ctx) for chat turns
+CHAT_CONTEXT_COMPRESS_RATIO = float(os.getenv("CHAT_CONTEXT_COMPRESS_RATIO", "0.75"))  # compress the session once its context fills this share of CHAT_NUM_CTX
+CHAT_SUMMARY_MAX_WORDS = int(os.getenv("CHAT_SUMMARY_MAX_WORDS", "150"))  # length of the rolling conversation summary
+
+# Sentiment analysis
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))  # lines per padded forward pass
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "50000"))  # lines kept in the in-process LRU
+SENTIMENT_CACHE_REDIS = os.getenv("SENTIMENT_CACHE_REDIS", "false").lower() in ("1", "true", "yes")  # share entries via Redis
+SENTIMENT_CACHE_TTL = int(os.getenv("SENTIMENT_CACHE_TTL", "604800"))  # seconds; Redis entries only, 0 = no expiry
+
+# Upload processing jobs
+UPLOAD_JOB_WORKERS = int(os.getenv("UPLOAD_JOB_WORKERS", "2"))
+UPLOAD_JOB_MAX_ATTEMPTS = int(os.getenv("UPLOAD_JOB_MAX_ATTEMPTS", "3"))
+UPLOAD_JOB_RETRY_DELAY = float(os.getenv("UPLOAD_JOB_RETRY_DELAY", "10"))  # seconds, doubled per attempt
+UPLOAD_JOB_HEARTBEAT_INTERVAL = float(os.getenv("UPLOAD_JOB_HEARTBEAT_INTERVAL", "30"))  # seconds between heartbeats / stale scans
+UPLOAD_JOB_STALE_AFTER = int(os.getenv("UPLOAD_JOB_STALE_AFTER", "120"))  # seconds without a heartbeat before a "running" job is reclaimed
+
+# Coalescing of concurrent insight generation (summary, minutes, sentiment)
+SINGLE_FLIGHT_REDIS = os.getenv("SINGLE_FLIGHT_REDIS", "true").lower() in ("1", "true", "yes")  # also across workers
+SINGLE_FLIGHT_LOCK_TTL = float(os.getenv("SINGLE_FLIGHT_LOCK_TTL", "900"))  # seconds; longest expected generation
+SINGLE_FLIGHT_POLL_INTERVAL = float(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL", "1"))  # seconds between lock checks
+
+# Executors for blocking work called from async routes
+CPU_EXECUTOR_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", "2"))
+CPU_EXECUTOR_QUEUE = int(os.getenv("CPU_EXECUTOR_QUEUE", "8"))
+IO_EXECUTOR_WORKERS = int(os.getenv("IO_EXECUTOR_WORKERS", "16"))
+IO_EXECUTOR_QUEUE = int(os.getenv("IO_EXECUTOR_QUEUE", "64"))
+
+# Transcription worker processes (0 = transcribe inside the API process)
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", "2"))
+TRANSCRIBE_INTRA_OP_THREADS = int(os.getenv("TRANSCRIBE_INTRA_OP_THREADS", "0"))  # 0 = cpu_count // workers
+
+# Voice activity detection before Whisper decoding
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() in ("1", "true", "yes")
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "30"))
+VAD_NOISE_MARGIN_DB = float(os.getenv("VAD_NOISE_MARGIN_DB", "10"))  # dB above the noise floor
+VAD_MIN_ENERGY_DB = float(os.getenv("VAD_MIN_ENERGY_DB", "-50"))
+VAD_MIN_SILENCE_MS = int(os.getenv("VAD_MIN_SILENCE_MS", "600"))
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "250"))
+VAD_PAD_MS = int(os.getenv("VAD_PAD_MS", "200"))
 
+# Transcript cache for re-uploaded media
+TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", os.path.join(UPLOAD_DIR, ".transcript_cache"))
+TRANSCRIPT_CACHE_MAX_MB = int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "512"))
+SUMMARY_CACHE_DIR = os.getenv("SUMMARY_CACHE_DIR", os.path.join(UPLOAD_DIR, ".summary_cache"))
+SUMMARY_CACHE_MAX_MB = int(os.getenv("SUMMARY_CACHE_MAX_MB", "64"))
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92"))  # question cosine similarity, 0 = off
+ANSWER_CACHE_MAX_PER_MEETING = int(os.getenv("ANSWER_CACHE_MAX_PER_MEETING", "100"))
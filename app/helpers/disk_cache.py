@@ -0,0 +1,114 @@
+import os
+import threading
+import uuid
+
+
+class DiskCache:
+    """
+    Size-bounded key/value cache of text entries stored as files in one directory.
+
+    Entries are evicted least-recently-used first (by file mtime, refreshed on
+    every hit) once the directory grows past `max_bytes`. Entries survive
+    restarts; hit/miss counters are per process.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ".txt"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size_bytes = None  # computed lazily from disk
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def _entries(self):
+        with os.scandir(self.directory) as it:
+            return [entry for entry in it if entry.is_file() and entry.name.endswith(self.suffix)]
+
+    def _current_size(self) -> int:
+        if self._size_bytes is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._size_bytes = sum(entry.stat().st_size for entry in self._entries())
+        return self._size_bytes
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: str):
+        data = value.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            size = self._current_size()
+            path = self._path(key)
+            if os.path.exists(path):
+                size -= os.path.getsize(path)
+
+            # Write atomically so concurrent readers never see a partial entry
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self._size_bytes = size + len(data)
+            if self._size_bytes > self.max_bytes:
+                self._evict(keep=path)
+
+    def delete(self, key: str):
+        with self._lock:
+            path = self._path(key)
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except FileNotFoundError:
+                return
+            if self._size_bytes is not None:
+                self._size_bytes -= size
+
+    def _evict(self, keep: str):
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._size_bytes <= self.max_bytes:
+                break
+            if entry.path == keep:
+                continue
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            self._size_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "size_bytes": self._current_size(),
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,79 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from app.helpers.constants import (
+    CPU_EXECUTOR_WORKERS,
+    CPU_EXECUTOR_QUEUE,
+    IO_EXECUTOR_WORKERS,
+    IO_EXECUTOR_QUEUE,
+)
+
+
+class ExecutorSaturatedError(HTTPException):
+    """Raised when an executor already has `max_workers + max_queue` tasks in flight."""
+
+    def __init__(self, name: str):
+        super().__init__(
+            status_code=503,
+            detail=f"Server is busy ({name} queue is full), please retry shortly",
+            headers={"Retry-After": "5"},
+        )
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a hard cap on running + waiting tasks.
+
+    Coroutines await blocking work through `run()` so the event loop stays free
+    for other requests. Once the cap is reached new work is rejected right away
+    with a 503 instead of piling up behind slow inference.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+
+    async def run(self, func, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorSaturatedError(self.name)
+
+        try:
+            future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        except Exception:
+            self._slots.release()
+            raise
+
+        # Release on completion of the underlying work, not of the awaiting
+        # coroutine, so a cancelled request keeps its slot until the thread is done.
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# CPU-bound model inference (summarization, sentiment, ...)
+cpu_executor = BoundedExecutor("model-cpu", CPU_EXECUTOR_WORKERS, CPU_EXECUTOR_QUEUE)
+
+# Blocking network / disk I/O (upstream HTTP calls, file copies, Redis scans)
+io_executor = BoundedExecutor("blocking-io", IO_EXECUTOR_WORKERS, IO_EXECUTOR_QUEUE)
+
+
+async def run_cpu_bound(func, *args, **kwargs):
+    return await cpu_executor.run(func, *args, **kwargs)
+
+
+async def run_io_bound(func, *args, **kwargs):
+    return await io_executor.run(func, *args, **kwargs)
+
+
+def shutdown_executors():
+    cpu_executor.shutdown()
+    io_executor.shutdown()
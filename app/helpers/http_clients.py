@@ -0,0 +1,249 @@
+import asyncio
+import contextlib
+import random
+import threading
+import time
+
+import httpx
+from fastapi import HTTPException
+
+from app.helpers.constants import (
+    DATAPREP_URL,
+    RETRIVER_URL,
+    EMBEDDING_URL,
+    OLLAMA_URL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_RETRIES,
+    HTTP_RETRY_BACKOFF,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    EMBEDDING_TIMEOUT,
+    RETRIEVER_TIMEOUT,
+    OLLAMA_TIMEOUT,
+    DATAPREP_TIMEOUT,
+)
+
+# Failures worth another attempt: the request never reached the upstream, or a
+# proxy in front of it reported it temporarily unavailable. Read timeouts are
+# not retried, since the upstream may still be working on the first attempt.
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.RemoteProtocolError)
+RETRYABLE_STATUS = {502, 503, 504}
+
+
+class UpstreamUnavailableError(HTTPException):
+    """Raised without calling the upstream while its circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(
+            status_code=503,
+            detail=f"Upstream service '{name}' is unavailable, please retry shortly",
+            headers={"Retry-After": str(max(1, int(retry_after)))},
+        )
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed calls and rejects calls
+    for `reset_timeout` seconds. After that one trial call per `reset_timeout`
+    is let through (half-open): success closes the circuit, failure keeps it open.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def allow(self) -> bool:
+        if self.failure_threshold <= 0:
+            return True
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open":
+                # Re-arm before the trial so concurrent callers keep failing fast
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class UpstreamClient:
+    """
+    Pooled keep-alive connection to one upstream service.
+
+    Every call goes through the circuit breaker and is retried with exponential
+    backoff (plus jitter) on connection errors and 502/503/504 responses.
+    """
+
+    def __init__(self, name: str, url: str, timeout: float):
+        self.name = name
+        self.url = url
+        self.timeout = httpx.Timeout(timeout, connect=HTTP_CONNECT_TIMEOUT)
+        self.breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self._client = None
+
+    def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS),
+            )
+
+    async def close(self):
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    def _check_circuit(self):
+        if self._client is None:
+            raise RuntimeError(f"HTTP client for '{self.name}' is not started")
+        if not self.breaker.allow():
+            raise UpstreamUnavailableError(self.name, self.breaker.retry_after())
+
+    async def _backoff(self, attempt: int):
+        self.retries += 1
+        delay = HTTP_RETRY_BACKOFF * (2 ** attempt)
+        await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+    async def post(self, **kwargs) -> httpx.Response:
+        """POSTs to the upstream URL; raises httpx.HTTPStatusError for error responses."""
+        self._check_circuit()
+        self.requests += 1
+        return await self._send(**kwargs)
+
+    async def _send(self, stream: bool = False, **kwargs) -> httpx.Response:
+        for attempt in range(HTTP_RETRIES + 1):
+            request = self._client.build_request("POST", self.url, **kwargs)
+            try:
+                response = await self._client.send(request, stream=stream)
+            except RETRYABLE_ERRORS:
+                if attempt < HTTP_RETRIES:
+                    await self._backoff(attempt)
+                    continue
+                self._record_failure()
+                raise
+            except httpx.HTTPError:
+                self._record_failure()
+                raise
+
+            if response.status_code in RETRYABLE_STATUS and attempt < HTTP_RETRIES:
+                await response.aclose()
+                await self._backoff(attempt)
+                continue
+
+            if response.status_code >= 500:
+                self._record_failure()
+            else:
+                self.breaker.record_success()
+
+            if response.is_error:
+                if stream:
+                    await response.aread()
+                    await response.aclose()
+                response.raise_for_status()
+            return response
+
+    @contextlib.asynccontextmanager
+    async def stream(self, **kwargs):
+        """
+        POSTs and yields the response before its body is read.
+
+        Only establishing the response is retried; once the body has started
+        streaming an error is passed on to the caller.
+        """
+        self._check_circuit()
+        self.requests += 1
+        response = await self._send(stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    def _record_failure(self):
+        self.failures += 1
+        self.breaker.record_failure()
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url,
+            "started": self._client is not None,
+            "circuit": self.breaker.state,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+class HttpClients:
+    """
+    Shared HTTP clients for the upstream services, opened on app startup and
+    closed on shutdown.
+
+    Coroutines use `get(name)` directly; code running in worker threads (upload
+    jobs) goes through `run_sync()`, which runs the call on the app's event loop.
+    """
+    _clients = {
+        "embedding": UpstreamClient("embedding", EMBEDDING_URL, EMBEDDING_TIMEOUT),
+        "retriever": UpstreamClient("retriever", RETRIVER_URL, RETRIEVER_TIMEOUT),
+        "ollama": UpstreamClient("ollama", OLLAMA_URL, OLLAMA_TIMEOUT),
+        "dataprep": UpstreamClient("dataprep", DATAPREP_URL, DATAPREP_TIMEOUT),
+    }
+    _loop = None
+
+    @classmethod
+    def start(cls):
+        cls._loop = asyncio.get_running_loop()
+        for client in cls._clients.values():
+            client.start()
+
+    @classmethod
+    async def stop(cls):
+        for client in cls._clients.values():
+            await client.close()
+        cls._loop = None
+
+    @classmethod
+    def get(cls, name: str) -> UpstreamClient:
+        return cls._clients[name]
+
+    @classmethod
+    def run_sync(cls, coro):
+        """Runs a coroutine on the app's event loop from a worker thread and waits for it."""
+        if cls._loop is None:
+            coro.close()
+            raise RuntimeError("HTTP clients are not started")
+        return asyncio.run_coroutine_threadsafe(coro, cls._loop).result()
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {name: client.stats() for name, client in cls._clients.items()}
@@ -1,28 +1,251 @@
 # model_loader.py
+import contextlib
+import copy
+import gc
+import threading
+import time
+
+import torch
 from transformers import AutoProcessor, AutoModelForSpeechSeq2Seq, pipeline
+from app.helpers.constants import (
+    WHISPER_MODEL_ID,
+    SUMMARIZER_MODEL_ID,
+    SENTIMENT_MODEL_ID,
+    INFERENCE_PRECISION,
+    MODEL_IDLE_TIMEOUT,
+    MODEL_MEMORY_BUDGET_MB,
+)
+from app.helpers.precision import apply_precision, resolve_precision
+
+
+def _load_whisper(precision):
+    processor = AutoProcessor.from_pretrained(WHISPER_MODEL_ID)
+    model = apply_precision(AutoModelForSpeechSeq2Seq.from_pretrained(WHISPER_MODEL_ID), precision)
+    return processor, model
+
+
+def _load_summarizer(precision):
+    summarizer = pipeline("summarization", model=SUMMARIZER_MODEL_ID)
+    summarizer.model = apply_precision(summarizer.model, precision)
+    return summarizer
+
+
+def _load_sentiment_analyzer(precision):
+    sentiment_analyzer = pipeline(
+        "text-classification",
+        model=SENTIMENT_MODEL_ID
+    )
+    sentiment_analyzer.model = apply_precision(sentiment_analyzer.model, precision)
+    return sentiment_analyzer
+
+
+def _resident_bytes(model) -> int:
+    """Bytes held by a model's weights and buffers, including packed int8 weights."""
+    modules = [model] if isinstance(model, torch.nn.Module) else [
+        part for part in (model if isinstance(model, tuple) else (getattr(model, "model", None),))
+        if isinstance(part, torch.nn.Module)
+    ]
+
+    def tensor_bytes(value):
+        if isinstance(value, torch.Tensor):
+            return value.nelement() * value.element_size()
+        if isinstance(value, (tuple, list)):
+            return sum(tensor_bytes(v) for v in value)
+        return 0
+
+    return sum(tensor_bytes(v) for module in modules for v in module.state_dict().values())
+
+
+def with_own_tokenizer(pipe):
+    """
+    Shallow copy of a pipeline with a private copy of its tokenizer; the model
+    weights stay shared. HF fast tokenizers are not thread-safe: threads calling
+    one with different truncation/padding settings fail with "Already borrowed".
+    """
+    pipe = copy.copy(pipe)
+    pipe.tokenizer = copy.deepcopy(pipe.tokenizer)
+    return pipe
+
 
 class ModelRegistry:
-    whisper_processor = None
-    whisper_model = None
-    summarizer = None
-    sentiment_analyzer = None  # ✅ Add this
+    """
+    Loads each model on first use, or ahead of time from a background warmup.
+
+    Every model has its own lock, so concurrent first requests wait for a single
+    load and requests that need a different model (or none) are not held up.
+
+    Loaded models are unloaded again when idle for MODEL_IDLE_TIMEOUT seconds,
+    or least-recently-used first when their resident size exceeds
+    MODEL_MEMORY_BUDGET_MB. Code running inference should hold the model through
+    `use()` so it is never picked for eviction mid-call.
+    """
+    _loaders = {
+        "whisper": _load_whisper,                    # (processor, model)
+        "summarizer": _load_summarizer,
+        "sentiment_analyzer": _load_sentiment_analyzer,
+    }
+    _models = {}
+    _locks = {name: threading.Lock() for name in _loaders}
+    _load_seconds = {}
+    _errors = {}
+
+    # Residency bookkeeping, guarded by _state_lock
+    _state_lock = threading.Lock()
+    _sizes = {}
+    _last_used = {}
+    _in_use = {name: 0 for name in _loaders}
+    _evictions = {name: 0 for name in _loaders}
+    _reaper = None
+
+    @classmethod
+    def get(cls, name: str):
+        model = cls._models.get(name)
+        if model is None:
+            model = cls._load(name)
+        with cls._state_lock:
+            cls._last_used[name] = time.monotonic()
+        return model
 
     @classmethod
-    def load_models(cls):
-        print("📦 Loading Whisper, summarizer, and sentiment analysis models...")
+    def _load(cls, name: str):
+        with cls._locks[name]:
+            if name not in cls._models:
+                precision = resolve_precision(INFERENCE_PRECISION)
+                print(f"📦 Loading {name} model ({precision})...")
+                start = time.perf_counter()
+                try:
+                    model = cls._loaders[name](precision)
+                except Exception as e:
+                    cls._errors[name] = str(e)
+                    raise
+                cls._load_seconds[name] = round(time.perf_counter() - start, 2)
+                cls._errors.pop(name, None)
 
-        # Whisper model
-        cls.whisper_processor = AutoProcessor.from_pretrained("openai/whisper-tiny")
-        cls.whisper_model = AutoModelForSpeechSeq2Seq.from_pretrained("openai/whisper-tiny")
-        cls.whisper_model.eval()
+                with cls._state_lock:
+                    cls._models[name] = model
+                    cls._sizes[name] = _resident_bytes(model)
+                    cls._last_used[name] = time.monotonic()
+                print(f"✅ {name} loaded in {cls._load_seconds[name]}s ({cls._sizes[name] / 2**20:.0f} MB)")
+            model = cls._models[name]
 
-        # Summarization model
-        cls.summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+        cls._enforce_budget(keep=name)
+        return model
 
-        # ✅ Sentiment analysis model
-        cls.sentiment_analyzer = pipeline(
-            "text-classification",
-            model="tabularisai/multilingual-sentiment-analysis"
-        )
+    @classmethod
+    @contextlib.contextmanager
+    def use(cls, name: str):
+        """Pins a model for the duration of an inference call."""
+        with cls._state_lock:
+            cls._in_use[name] += 1
+        try:
+            yield cls.get(name)
+        finally:
+            with cls._state_lock:
+                cls._in_use[name] -= 1
+                cls._last_used[name] = time.monotonic()
+
+    @classmethod
+    def unload(cls, name: str) -> bool:
+        """Drops a loaded model unless it is currently in use."""
+        with cls._locks[name]:
+            with cls._state_lock:
+                if name not in cls._models or cls._in_use[name] > 0:
+                    return False
+                del cls._models[name]
+                cls._sizes.pop(name, None)
+                cls._evictions[name] += 1
+        gc.collect()
+        print(f"♻️ Unloaded {name} model")
+        return True
+
+    @classmethod
+    def _enforce_budget(cls, keep: str = None):
+        if MODEL_MEMORY_BUDGET_MB <= 0:
+            return
+
+        budget = MODEL_MEMORY_BUDGET_MB * 1024 * 1024
+        while True:
+            with cls._state_lock:
+                if sum(cls._sizes.values()) <= budget:
+                    return
+                candidates = sorted(
+                    (name for name in cls._models if name != keep and cls._in_use[name] == 0),
+                    key=lambda name: cls._last_used.get(name, 0)
+                )
+            if not candidates:
+                return  # everything else is busy; stay over budget until it is released
+            cls.unload(candidates[0])
+
+    @classmethod
+    def evict_idle(cls, idle_timeout: float = MODEL_IDLE_TIMEOUT):
+        if idle_timeout <= 0:
+            return
+        now = time.monotonic()
+        with cls._state_lock:
+            idle = [
+                name for name in cls._models
+                if cls._in_use[name] == 0 and now - cls._last_used.get(name, now) > idle_timeout
+            ]
+        for name in idle:
+            cls.unload(name)
+
+    @classmethod
+    def start_reaper(cls):
+        """Background thread that unloads models idle longer than MODEL_IDLE_TIMEOUT."""
+        if MODEL_IDLE_TIMEOUT <= 0 or cls._reaper is not None:
+            return
 
-        print("✅ All models loaded successfully.")
\ No newline at end of file
+        def reap():
+            interval = max(1.0, min(60.0, MODEL_IDLE_TIMEOUT / 2))
+            while True:
+                time.sleep(interval)
+                try:
+                    cls.evict_idle()
+                except Exception as e:
+                    print(f"❌ Idle model eviction failed: {e}")
+
+        cls._reaper = threading.Thread(target=reap, name="model-reaper", daemon=True)
+        cls._reaper.start()
+
+    @classmethod
+    def load_models(cls, names=None):
+        for name in names or cls._loaders:
+            try:
+                cls.get(name)
+            except Exception as e:
+                print(f"❌ Failed to load {name}: {e}")
+
+    @classmethod
+    def warmup(cls, names=None):
+        """Loads models in a background thread so startup does not wait for them."""
+        thread = threading.Thread(target=cls.load_models, args=(names,), name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    @classmethod
+    def status(cls) -> dict:
+        now = time.monotonic()
+        with cls._state_lock:
+            models = {
+                name: {
+                    "loaded": name in cls._models,
+                    "loading": cls._locks[name].locked(),
+                    "load_seconds": cls._load_seconds.get(name),
+                    "error": cls._errors.get(name),
+                    "resident_mb": round(cls._sizes[name] / 2**20, 1) if name in cls._sizes else 0.0,
+                    "idle_seconds": round(now - cls._last_used[name], 1) if name in cls._models else None,
+                    "in_use": cls._in_use[name],
+                    "evictions": cls._evictions[name],
+                }
+                for name in cls._loaders
+            }
+        return models
+
+    @classmethod
+    def memory(cls) -> dict:
+        with cls._state_lock:
+            return {
+                "resident_mb": round(sum(cls._sizes.values()) / 2**20, 1),
+                "budget_mb": MODEL_MEMORY_BUDGET_MB or None,
+                "idle_timeout_seconds": MODEL_IDLE_TIMEOUT or None,
+            }
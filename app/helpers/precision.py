@@ -0,0 +1,167 @@
+import argparse
+import copy
+import functools
+import io
+import json
+import time
+
+import torch
+
+from app.helpers.constants import INFERENCE_PRECISION
+
+SUPPORTED_PRECISIONS = ("fp32", "int8", "bf16")
+
+
+def bf16_supported() -> bool:
+    """True when the CPU has native bf16 kernels (AVX512-BF16 / AMX)."""
+    try:
+        return torch.backends.mkldnn.is_available() and torch.ops.mkldnn._is_mkldnn_bf16_supported()
+    except (AttributeError, RuntimeError):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_precision(precision: str = INFERENCE_PRECISION) -> str:
+    """Validates the requested precision, falling back to fp32 where it cannot run. Memoized, so it warns once."""
+    precision = (precision or "fp32").lower()
+    if precision not in SUPPORTED_PRECISIONS:
+        raise ValueError(f"Unsupported inference precision '{precision}', expected one of {SUPPORTED_PRECISIONS}")
+    if precision == "bf16" and not bf16_supported():
+        print("⚠️ bf16 requested but this CPU has no native bf16 support, using fp32")
+        return "fp32"
+    return precision
+
+
+def apply_precision(model, precision: str = INFERENCE_PRECISION):
+    """
+    Converts an fp32 model to the configured inference precision.
+
+    int8 applies dynamic quantization to every nn.Linear (weights stored as
+    int8, activations quantized on the fly); bf16 casts all weights.
+
+    Returns:
+        The converted model (a new module for int8, the same one for fp32/bf16).
+    """
+    precision = resolve_precision(precision)
+    if precision == "int8":
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    elif precision == "bf16":
+        model = model.to(torch.bfloat16)
+    model.eval()
+    return model
+
+
+def model_size_mb(model) -> float:
+    """Serialized state_dict size, which also counts packed int8 weights."""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return round(buffer.tell() / (1024 * 1024), 1)
+
+
+# -------------------- fp32 vs. reduced precision comparison --------------------
+
+SAMPLE_TEXTS = [
+    "Okay, let's get started, thanks everyone for joining.",
+    "I'm really worried we won't make the release date with the current staffing.",
+    "Great work on the dashboard, the client loved the demo yesterday.",
+    "Can you hear me? I think my microphone was muted.",
+    "The vendor missed the deadline again, this is getting frustrating.",
+    "We agreed to move the migration to next sprint and Priya will own the rollback plan.",
+]
+
+
+def _timed(fn, repeats: int):
+    fn()  # warmup
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeats * 1000
+
+
+def _word_overlap_f1(reference: str, candidate: str) -> float:
+    ref, cand = reference.lower().split(), candidate.lower().split()
+    if not ref or not cand:
+        return float(ref == cand)
+    common = sum(min(ref.count(w), cand.count(w)) for w in set(cand))
+    if common == 0:
+        return 0.0
+    precision, recall = common / len(cand), common / len(ref)
+    return round(2 * precision * recall / (precision + recall), 3)
+
+
+def _word_error_rate(reference: str, candidate: str) -> float:
+    ref, cand = reference.lower().split(), candidate.lower().split()
+    row = list(range(len(cand) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, c in enumerate(cand, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != c))
+    return round(row[-1] / max(1, len(ref)), 3)
+
+
+def compare_precision(precision: str, texts=SAMPLE_TEXTS, audio_path: str = None, repeats: int = 3) -> dict:
+    """
+    Runs the sentiment, summarization and (optionally) Whisper models in fp32 and
+    in `precision`, reporting output agreement, mean latency and model size.
+    """
+    from transformers import AutoProcessor, AutoModelForSpeechSeq2Seq, pipeline
+    from app.helpers.constants import WHISPER_MODEL_ID, SUMMARIZER_MODEL_ID, SENTIMENT_MODEL_ID
+
+    precision = resolve_precision(precision)
+    report = {"precision": precision}
+
+    # Sentiment: label agreement
+    fp32_clf = pipeline("text-classification", model=SENTIMENT_MODEL_ID)
+    low_clf = copy.copy(fp32_clf)
+    low_clf.model = apply_precision(copy.deepcopy(fp32_clf.model), precision)
+    fp32_out, fp32_ms = _timed(lambda: fp32_clf(list(texts)), repeats)
+    low_out, low_ms = _timed(lambda: low_clf(list(texts)), repeats)
+    report["sentiment"] = {
+        "label_agreement": round(sum(a["label"] == b["label"] for a, b in zip(fp32_out, low_out)) / len(texts), 3),
+        "max_score_delta": round(max(abs(a["score"] - b["score"]) for a, b in zip(fp32_out, low_out)), 3),
+        "fp32_ms": round(fp32_ms, 1), f"{precision}_ms": round(low_ms, 1),
+        "fp32_mb": model_size_mb(fp32_clf.model), f"{precision}_mb": model_size_mb(low_clf.model),
+    }
+
+    # Summarization: word overlap with the fp32 summary
+    document = " ".join(texts * 4)
+    fp32_sum = pipeline("summarization", model=SUMMARIZER_MODEL_ID)
+    low_sum = copy.copy(fp32_sum)
+    low_sum.model = apply_precision(copy.deepcopy(fp32_sum.model), precision)
+    kwargs = {"max_length": 80, "min_length": 20, "do_sample": False}
+    fp32_text, fp32_ms = _timed(lambda: fp32_sum(document, **kwargs)[0]["summary_text"], repeats)
+    low_text, low_ms = _timed(lambda: low_sum(document, **kwargs)[0]["summary_text"], repeats)
+    report["summarization"] = {
+        "word_overlap_f1": _word_overlap_f1(fp32_text, low_text),
+        "fp32_ms": round(fp32_ms, 1), f"{precision}_ms": round(low_ms, 1),
+        "fp32_mb": model_size_mb(fp32_sum.model), f"{precision}_mb": model_size_mb(low_sum.model),
+    }
+
+    # Whisper: word error rate against the fp32 transcript
+    if audio_path:
+        from app.helpers.audio_stream import iter_audio_blocks, iter_fixed_windows
+        from app.helpers.utils import transcribe_chunks, MAX_DURATION
+
+        processor = AutoProcessor.from_pretrained(WHISPER_MODEL_ID)
+        fp32_asr = AutoModelForSpeechSeq2Seq.from_pretrained(WHISPER_MODEL_ID).eval()
+        low_asr = apply_precision(copy.deepcopy(fp32_asr), precision)
+        windows = list(iter_fixed_windows(iter_audio_blocks(audio_path), MAX_DURATION * 16000))[:4]
+        fp32_text, fp32_ms = _timed(lambda: " ".join(transcribe_chunks(windows, fp32_asr, processor)), repeats)
+        low_text, low_ms = _timed(lambda: " ".join(transcribe_chunks(windows, low_asr, processor)), repeats)
+        report["transcription"] = {
+            "word_error_rate_vs_fp32": _word_error_rate(fp32_text, low_text),
+            "fp32_ms": round(fp32_ms, 1), f"{precision}_ms": round(low_ms, 1),
+            "fp32_mb": model_size_mb(fp32_asr), f"{precision}_mb": model_size_mb(low_asr),
+        }
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare reduced-precision inference against fp32")
+    parser.add_argument("--precision", default="int8", choices=SUPPORTED_PRECISIONS)
+    parser.add_argument("--audio", default=None, help="Optional audio file for the Whisper comparison")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(compare_precision(args.precision, audio_path=args.audio, repeats=args.repeats), indent=2))
@@ -0,0 +1,85 @@
+import hashlib
+import os
+import threading
+
+# upload_id -> (bytes hashed so far, running sha256) for sessions touched by this process
+_checksums = {}
+_checksums_lock = threading.Lock()
+
+READ_BUFFER = 1024 * 1024
+
+
+def checksum_state(upload_id: str, part_path: str, received_bytes: int):
+    """
+    Returns the running sha256 of the first `received_bytes` of an upload.
+
+    The digest normally lives in memory between chunks. If it is missing or
+    stale (process restart, or chunks handled by another worker), only the
+    bytes it has not seen yet are read back from the partial file.
+    """
+    with _checksums_lock:
+        hashed, digest = _checksums.get(upload_id, (0, None))
+
+    if digest is None or hashed > received_bytes:
+        hashed, digest = 0, hashlib.sha256()
+
+    if hashed < received_bytes:
+        with open(part_path, "rb") as f:
+            f.seek(hashed)
+            remaining = received_bytes - hashed
+            while remaining > 0:
+                block = f.read(min(READ_BUFFER, remaining))
+                if not block:
+                    raise ValueError(f"Partial upload {upload_id} is shorter than its recorded size")
+                digest.update(block)
+                remaining -= len(block)
+
+    return digest
+
+
+def write_at(part_path: str, offset: int, data: bytes, digest):
+    """Writes `data` at `offset` of the partial file and folds it into the checksum."""
+    mode = "r+b" if os.path.exists(part_path) else "wb"
+    with open(part_path, mode) as f:
+        f.seek(offset)
+        f.write(data)
+    digest.update(data)
+
+
+def remember_checksum(upload_id: str, hashed_bytes: int, digest):
+    with _checksums_lock:
+        _checksums[upload_id] = (hashed_bytes, digest)
+
+
+def forget_checksum(upload_id: str):
+    with _checksums_lock:
+        _checksums.pop(upload_id, None)
+
+
+def complete_upload(part_path: str, final_path: str, size: int):
+    """Drops any bytes past the acknowledged size and moves the file into place."""
+    with open(part_path, "r+b") as f:
+        f.truncate(size)
+    os.replace(part_path, final_path)
+
+
+def discard_parts(parts) -> list:
+    """
+    Deletes the partial files of unfinished upload sessions.
+
+    Args:
+        parts (List[Tuple[str, str]]): (upload id, part path) of each session.
+
+    Returns:
+        List[str]: Paths that were deleted.
+    """
+    deleted = []
+    for upload_id, part_path in parts:
+        forget_checksum(upload_id)
+        if part_path and os.path.exists(part_path):
+            try:
+                os.remove(part_path)
+                deleted.append(part_path)
+            except OSError as e:
+                print(f"Failed to delete file {part_path}: {str(e)}")
+    return deleted
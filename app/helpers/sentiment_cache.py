@@ -0,0 +1,123 @@
+import collections
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+
+import redis
+
+from app.helpers.constants import (
+    SENTIMENT_MODEL_ID,
+    INFERENCE_PRECISION,
+    SENTIMENT_CACHE_SIZE,
+    SENTIMENT_CACHE_REDIS,
+    SENTIMENT_CACHE_TTL,
+)
+from app.helpers.precision import resolve_precision
+
+
+def normalize_line(line: str) -> str:
+    """Unicode-normalized line with runs of whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFC", line).split())
+
+
+class SentimentCache:
+    """
+    Bounded LRU cache of (label, score) per transcript line, shared across meetings.
+
+    Keys hash the normalized line together with the model id and precision, so
+    a model change never serves stale labels. With a Redis client, entries are
+    also written to Redis (with an optional TTL) so every worker process and
+    restart reuses them; the in-process LRU stays in front of it.
+    """
+
+    def __init__(self, max_entries: int, redis_client=None, ttl: int = 0):
+        self.max_entries = max_entries
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._scope = f"{SENTIMENT_MODEL_ID}:{resolve_precision(INFERENCE_PRECISION)}"
+
+    def key(self, line: str) -> str:
+        return hashlib.sha256(f"{self._scope}:{normalize_line(line)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, lines):
+        """Returns a (label, score) tuple or None for every line."""
+        keys = [self.key(line) for line in lines]
+        values = [None] * len(keys)
+
+        with self._lock:
+            for index, key in enumerate(keys):
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    values[index] = self._entries[key]
+
+        missing = [index for index, value in enumerate(values) if value is None]
+        if missing and self.redis_client is not None:
+            try:
+                stored = self.redis_client.mget([f"sentiment:{keys[index]}" for index in missing])
+            except Exception as e:
+                print(f"❌ Sentiment cache lookup in Redis failed: {e}")
+                stored = [None] * len(missing)
+            found = {}
+            for index, raw in zip(missing, stored):
+                if raw is not None:
+                    values[index] = tuple(json.loads(raw))
+                    found[keys[index]] = values[index]
+            self._remember(found)
+
+        with self._lock:
+            hits = sum(value is not None for value in values)
+            self.hits += hits
+            self.misses += len(values) - hits
+        return values
+
+    def put_many(self, items):
+        """Stores {line: (label, score)} entries."""
+        entries = {self.key(line): (label, score) for line, (label, score) in items.items()}
+        if not entries:
+            return
+        self._remember(entries)
+
+        if self.redis_client is not None:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, value in entries.items():
+                    pipe.set(f"sentiment:{key}", json.dumps(value), ex=self.ttl or None)
+                pipe.execute()
+            except Exception as e:
+                print(f"❌ Sentiment cache write to Redis failed: {e}")
+
+    def _remember(self, entries: dict):
+        with self._lock:
+            for key, value in entries.items():
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "redis": self.redis_client is not None,
+            }
+
+
+sentiment_cache = SentimentCache(
+    SENTIMENT_CACHE_SIZE,
+    redis_client=redis.Redis(host=os.getenv("REDIS_HOST"), port=os.getenv("REDIS_PORT"), db=os.getenv("REDIS_DB")) if SENTIMENT_CACHE_REDIS else None,
+    ttl=SENTIMENT_CACHE_TTL,
+)
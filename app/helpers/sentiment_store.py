@@ -0,0 +1,145 @@
+import hashlib
+
+import numpy as np
+
+COLUMNAR_FORMAT = "columnar-v1"
+
+# Polarity of the sentiment model's labels; unknown labels count as neutral
+LABEL_POLARITY = {
+    "Very Negative": -1.0,
+    "Negative": -0.5,
+    "Neutral": 0.0,
+    "Positive": 0.5,
+    "Very Positive": 1.0,
+}
+
+
+def is_columnar(data) -> bool:
+    return isinstance(data, dict) and data.get("format") == COLUMNAR_FORMAT
+
+
+def transcript_hash(transcript_lines) -> str:
+    return hashlib.sha256("".join(transcript_lines).encode("utf-8")).hexdigest()
+
+
+def matches_transcript(data, transcript_lines) -> bool:
+    """
+    False when a columnar record was computed from a different transcript, so
+    its line numbers no longer point at the lines that were analyzed. Legacy
+    records carry their own line text and always match.
+    """
+    return not is_columnar(data) or data.get("transcript_sha256") == transcript_hash(transcript_lines)
+
+
+def to_columnar(results, line_numbers, transcript_lines) -> dict:
+    """
+    Packs per-line sentiment results into parallel arrays.
+
+    Lines are referenced by their line number in the transcript file instead of
+    being copied; labels are stored once and referred to by code (-1 = error).
+    The transcript's hash is stored alongside, see `matches_transcript`.
+
+    Args:
+        results (List[Dict]): Output of `analyze_sentiment`, one entry per line.
+        line_numbers (List[int]): Transcript line number of each result.
+        transcript_lines (List[str]): Raw transcript file lines the results refer to.
+    """
+    labels, codes, scores, errors = [], [], [], {}
+    for position, result in enumerate(results):
+        if result["label"] == "error":
+            codes.append(-1)
+            errors[str(position)] = result.get("error", "")
+        else:
+            if result["label"] not in labels:
+                labels.append(result["label"])
+            codes.append(labels.index(result["label"]))
+        scores.append(result["score"])
+
+    return {
+        "format": COLUMNAR_FORMAT,
+        "transcript_sha256": transcript_hash(transcript_lines) if transcript_lines is not None else None,
+        "labels": labels,
+        "lines": list(line_numbers),
+        "codes": codes,
+        "scores": scores,
+        "errors": errors,
+    }
+
+
+def from_legacy(results) -> dict:
+    """Converts the old list-of-dicts format; line numbers are result positions."""
+    return to_columnar(results or [], range(len(results or [])), None)
+
+
+def expand(data, transcript_lines=None) -> list:
+    """
+    Rebuilds the per-line list of dicts served by `/meetings/get_sentiment`.
+
+    Args:
+        data (dict): Columnar sentiment record.
+        transcript_lines (List[str]): Raw transcript file lines, to fill in line text.
+    """
+    expanded = []
+    for position, (line_number, code, score) in enumerate(zip(data["lines"], data["codes"], data["scores"])):
+        line = transcript_lines[line_number].strip() if transcript_lines and line_number < len(transcript_lines) else None
+        if code < 0:
+            expanded.append({"line": line, "label": "error", "score": score, "error": data["errors"].get(str(position), "")})
+        else:
+            expanded.append({"line": line, "label": data["labels"][code], "score": score})
+    return expanded
+
+
+def sentiment_aggregates(data, windows: int = 20) -> dict:
+    """
+    Label distribution and a rolling sentiment curve over `windows` equal spans of lines.
+
+    Each line contributes its label polarity (-1 very negative .. 1 very
+    positive) weighted by the model's confidence; failed lines are left out.
+    """
+    codes = np.asarray(data["codes"], dtype=np.int64)
+    scores = np.asarray(data["scores"], dtype=np.float64)
+    lines = np.asarray(data["lines"], dtype=np.int64)
+    labels = data["labels"]
+
+    valid = codes >= 0
+    codes, scores, lines = codes[valid], scores[valid], lines[valid]
+    polarity = np.asarray([LABEL_POLARITY.get(label, 0.0) for label in labels], dtype=np.float64)
+    values = polarity[codes] * scores if len(codes) else np.zeros(0)
+
+    counts = np.bincount(codes, minlength=len(labels)) if len(codes) else np.zeros(len(labels), dtype=np.int64)
+    distribution = {
+        label: {"count": int(count), "ratio": round(float(count) / len(codes), 3) if len(codes) else 0.0}
+        for label, count in zip(labels, counts)
+    }
+
+    curve = []
+    windows = max(1, min(windows, len(codes)))
+    if len(codes):
+        starts = np.linspace(0, len(codes), windows + 1).astype(np.int64)[:-1]
+        sizes = np.diff(np.append(starts, len(codes)))
+        means = np.add.reduceat(values, starts) / sizes
+
+        # Per-window label counts from one-hot rows, for the dominant label
+        one_hot = np.zeros((len(codes), len(labels)), dtype=np.int64)
+        one_hot[np.arange(len(codes)), codes] = 1
+        window_counts = np.add.reduceat(one_hot, starts, axis=0)
+        dominant = window_counts.argmax(axis=1)
+
+        ends = np.append(starts[1:], len(codes)) - 1
+        for index in range(windows):
+            curve.append({
+                "window": index,
+                "start_line": int(lines[starts[index]]),
+                "end_line": int(lines[ends[index]]),
+                "lines": int(sizes[index]),
+                "sentiment": round(float(means[index]), 3),
+                "dominant_label": labels[dominant[index]],
+            })
+
+    return {
+        "line_count": int(len(data["codes"])),
+        "error_count": int((~valid).sum()),
+        "average_sentiment": round(float(values.mean()), 3) if len(values) else 0.0,
+        "label_distribution": distribution,
+        "curve": curve,
+    }
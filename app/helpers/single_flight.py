@@ -0,0 +1,126 @@
+import asyncio
+import os
+import time
+import uuid
+
+import redis.asyncio as aioredis
+
+from app.helpers.constants import SINGLE_FLIGHT_REDIS, SINGLE_FLIGHT_LOCK_TTL, SINGLE_FLIGHT_POLL_INTERVAL
+from app.logger import Logger
+
+logger_instance = Logger()
+logger = logger_instance.get_logger("single_flight")
+
+# Deletes the lock only if this worker still owns it
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent computations of the same result.
+
+    Within a worker process, callers with the same key share one asyncio task;
+    the task keeps running if the request that started it goes away, so its
+    result is still stored. Across workers a Redis lock elects one computing
+    worker: the others wait for the lock to be released and then load the
+    stored result through `load_existing`, taking over only if there is none
+    (the computing worker failed). Without Redis, only in-process coalescing
+    applies.
+    """
+
+    def __init__(self, redis_client=None, lock_ttl: float = SINGLE_FLIGHT_LOCK_TTL, poll_interval: float = SINGLE_FLIGHT_POLL_INTERVAL):
+        self.redis_client = redis_client
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.executed = 0
+        self.coalesced = 0
+        self.remote_waits = 0
+        self._inflight = {}
+
+    async def run(self, key: str, compute, load_existing=None):
+        """
+        Args:
+            key (str): Identifies the result, e.g. "summary:42".
+            compute: Coroutine function that computes and stores the result.
+            load_existing: Function returning the stored result, or None.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run_exclusive(key, compute, load_existing))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every caller went away
+
+    async def _run_exclusive(self, key: str, compute, load_existing):
+        if self.redis_client is None:
+            self.executed += 1
+            return await compute()
+
+        lock_name = f"single_flight:{key}"
+        token = uuid.uuid4().hex
+        waited = False
+        while True:
+            try:
+                acquired = await self.redis_client.set(lock_name, token, nx=True, px=int(self.lock_ttl * 1000))
+            except Exception as e:
+                logger.warning(f"Redis lock for {key} unavailable, computing without it: {e}")
+                self.executed += 1
+                return await compute()
+
+            if acquired:
+                try:
+                    # The previous holder may have stored the result just before releasing
+                    if load_existing is not None:
+                        existing = load_existing()
+                        if existing is not None:
+                            return existing
+                    self.executed += 1
+                    return await compute()
+                finally:
+                    try:
+                        await self.redis_client.eval(_RELEASE_SCRIPT, 1, lock_name, token)
+                    except Exception as e:
+                        logger.warning(f"Failed to release Redis lock for {key}: {e}")
+
+            # Another worker is computing: wait for it, then use what it stored
+            if not waited:
+                self.remote_waits += 1
+                waited = True
+            deadline = time.monotonic() + self.lock_ttl
+            try:
+                while time.monotonic() < deadline and await self.redis_client.exists(lock_name):
+                    await asyncio.sleep(self.poll_interval)
+            except Exception as e:
+                logger.warning(f"Lost Redis while waiting on {key}: {e}")
+
+            if load_existing is not None:
+                existing = load_existing()
+                if existing is not None:
+                    return existing
+
+    def stats(self) -> dict:
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "remote_waits": self.remote_waits,
+            "in_flight": len(self._inflight),
+            "redis": self.redis_client is not None,
+        }
+
+
+single_flight = SingleFlight(
+    redis_client=aioredis.Redis(host=os.getenv("REDIS_HOST"), port=os.getenv("REDIS_PORT"), db=os.getenv("REDIS_DB")) if SINGLE_FLIGHT_REDIS else None,
+)
@@ -0,0 +1,30 @@
+import functools
+import hashlib
+import json
+
+from app.helpers.constants import (
+    SUMMARIZER_MODEL_ID,
+    INFERENCE_PRECISION,
+    SUMMARY_CACHE_DIR,
+    SUMMARY_CACHE_MAX_MB,
+)
+from app.helpers.disk_cache import DiskCache
+from app.helpers.precision import resolve_precision
+
+# Per-chunk BART summaries, keyed by chunk text + generation settings
+summary_cache = DiskCache(SUMMARY_CACHE_DIR, SUMMARY_CACHE_MAX_MB * 1024 * 1024)
+
+
+@functools.lru_cache(maxsize=256)
+def _settings_json(max_length: int, min_length: int) -> str:
+    return json.dumps({
+        "model": SUMMARIZER_MODEL_ID,
+        "precision": resolve_precision(INFERENCE_PRECISION),
+        "max_length": max_length,
+        "min_length": min_length,
+        "do_sample": False,
+    }, sort_keys=True)
+
+
+def summary_cache_key(chunk: str, max_length: int, min_length: int) -> str:
+    return hashlib.sha256(f"{_settings_json(max_length, min_length)}:{chunk}".encode("utf-8")).hexdigest()
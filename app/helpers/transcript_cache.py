@@ -0,0 +1,52 @@
+import functools
+import hashlib
+import json
+
+from app.helpers.constants import (
+    WHISPER_MODEL_ID,
+    INFERENCE_PRECISION,
+    VAD_ENABLED,
+    VAD_FRAME_MS,
+    VAD_NOISE_MARGIN_DB,
+    VAD_MIN_ENERGY_DB,
+    VAD_MIN_SILENCE_MS,
+    VAD_MIN_SPEECH_MS,
+    VAD_PAD_MS,
+    TRANSCRIPT_CACHE_DIR,
+    TRANSCRIPT_CACHE_MAX_MB,
+)
+from app.helpers.disk_cache import DiskCache
+from app.helpers.precision import resolve_precision
+from app.helpers.utils import MAX_DURATION
+
+# Transcripts of previously uploaded media, keyed by content hash + decoding settings
+transcript_cache = DiskCache(TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024)
+
+
+@functools.lru_cache(maxsize=None)
+def _settings_json() -> str:
+    return json.dumps(decoding_settings(), sort_keys=True)
+
+
+def decoding_settings() -> dict:
+    """Everything besides the media bytes that changes the transcript."""
+    settings = {
+        "model": WHISPER_MODEL_ID,
+        "precision": resolve_precision(INFERENCE_PRECISION),
+        "max_duration": MAX_DURATION,
+        "vad": VAD_ENABLED,
+    }
+    if VAD_ENABLED:
+        settings.update({
+            "vad_frame_ms": VAD_FRAME_MS,
+            "vad_noise_margin_db": VAD_NOISE_MARGIN_DB,
+            "vad_min_energy_db": VAD_MIN_ENERGY_DB,
+            "vad_min_silence_ms": VAD_MIN_SILENCE_MS,
+            "vad_min_speech_ms": VAD_MIN_SPEECH_MS,
+            "vad_pad_ms": VAD_PAD_MS,
+        })
+    return settings
+
+
+def transcript_cache_key(content_hash: str) -> str:
+    return hashlib.sha256(f"{content_hash}:{_settings_json()}".encode("utf-8")).hexdigest()
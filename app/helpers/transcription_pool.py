@@ -0,0 +1,158 @@
+import collections
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.helpers.constants import (
+    WHISPER_MODEL_ID,
+    INFERENCE_PRECISION,
+    TRANSCRIBE_WORKERS,
+    TRANSCRIBE_INTRA_OP_THREADS,
+)
+from app.logger import Logger
+
+logger_instance = Logger()
+logger = logger_instance.get_logger("transcription_pool")
+
+# Per-process Whisper instance, loaded once by the pool initializer
+_worker_model = None
+_worker_processor = None
+
+
+def _init_worker(model_id: str, precision: str, num_threads: int):
+    global _worker_model, _worker_processor
+
+    import torch
+    from transformers import AutoProcessor, AutoModelForSpeechSeq2Seq
+    from app.helpers.precision import apply_precision
+
+    torch.set_num_threads(num_threads)
+    torch.set_num_interop_threads(1)
+
+    _worker_processor = AutoProcessor.from_pretrained(model_id)
+    _worker_model = apply_precision(AutoModelForSpeechSeq2Seq.from_pretrained(model_id), precision)
+    print(f"✅ Transcription worker {os.getpid()} loaded {model_id} ({precision}, {num_threads} threads)")
+
+
+def _transcribe_batch(chunks):
+    # Imported here: utils imports this module at load time
+    from app.helpers.utils import transcribe_chunks
+
+    return transcribe_chunks(chunks, _worker_model, _worker_processor)
+
+
+class TranscriptionPool:
+    """
+    Pool of worker processes, each holding its own Whisper model.
+
+    Batches of chunks are spread over the processes; results come back in
+    submission order. Several uploads can share the pool at once since
+    every call only waits on its own batches.
+    """
+    _executor = None
+    _num_workers = 0
+    _num_threads = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def start(cls, num_workers: int = TRANSCRIBE_WORKERS, num_threads: int = TRANSCRIBE_INTRA_OP_THREADS):
+        if cls._executor is not None or num_workers <= 0:
+            return
+
+        if num_threads <= 0:
+            # Split the cores between workers so torch does not oversubscribe the box
+            num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+
+        cls._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(WHISPER_MODEL_ID, INFERENCE_PRECISION, num_threads),
+        )
+        cls._num_workers = num_workers
+        cls._num_threads = num_threads
+        logger.info(f"Started transcription pool with {num_workers} processes x {num_threads} threads")
+
+    @classmethod
+    def stop(cls):
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+            cls._num_workers = 0
+
+    @classmethod
+    def _restart(cls, broken):
+        """Replaces a broken executor (a worker died, e.g. OOM-killed) and returns the live one."""
+        with cls._lock:
+            # Another caller may already have replaced it
+            if cls._executor is broken:
+                logger.warning("Transcription pool is broken, restarting it")
+                num_workers, num_threads = cls._num_workers, cls._num_threads
+                cls.stop()
+                cls.start(num_workers, num_threads)
+            return cls._executor
+
+    @staticmethod
+    def _submit(executor, batch):
+        try:
+            return executor.submit(_transcribe_batch, batch)
+        except BrokenProcessPool as e:
+            # Surfaces when the result is collected, where the pool is restarted
+            future = Future()
+            future.set_exception(e)
+            return future
+
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls._executor is not None
+
+    @classmethod
+    def num_workers(cls) -> int:
+        return cls._num_workers
+
+    @classmethod
+    def transcribe_batches(cls, batches):
+        """
+        Transcribes batches of audio chunks across the worker processes.
+
+        Batches are submitted as the iterable produces them, with at most two
+        per worker in flight, so a streamed recording is never fully buffered.
+
+        Args:
+            batches (Iterable[List[np.ndarray]]): 16 kHz mono chunk batches, in playback order.
+
+        Returns:
+            List[str]: One transcription per chunk, in the original order.
+        """
+        max_in_flight = 2 * cls._num_workers
+        in_flight = collections.deque()  # (batch, future), kept for resubmission
+        texts = []
+        executor = cls._executor
+        restarted = False
+
+        def collect_oldest():
+            nonlocal executor, restarted
+            try:
+                result = in_flight[0][1].result()
+            except BrokenProcessPool:
+                # Every pending future of a broken pool fails; restart once and resubmit them
+                if restarted:
+                    raise
+                restarted = True
+                executor = cls._restart(executor)
+                for index, (batch, _) in enumerate(in_flight):
+                    in_flight[index] = (batch, cls._submit(executor, batch))
+                result = in_flight[0][1].result()
+            in_flight.popleft()
+            texts.extend(result)
+
+        for batch in batches:
+            in_flight.append((batch, cls._submit(executor, batch)))
+            if len(in_flight) >= max_in_flight:
+                collect_oldest()
+
+        while in_flight:
+            collect_oldest()
+        return texts
@@ -0,0 +1,392 @@
+import datetime as _dt
+import os
+import queue
+import socket
+import threading
+
+import sqlalchemy as _sql
+
+import app.local_database.database as _database
+import app.local_database.models as _models
+from app.helpers.constants import (
+    UPLOAD_JOB_WORKERS,
+    UPLOAD_JOB_MAX_ATTEMPTS,
+    UPLOAD_JOB_RETRY_DELAY,
+    UPLOAD_JOB_HEARTBEAT_INTERVAL,
+    UPLOAD_JOB_STALE_AFTER,
+)
+from app.helpers.utils import transcribe_audio, transcribe_video, ingest_transcript
+from app.helpers.http_clients import HttpClients
+from app.helpers.answer_cache import answer_cache
+from app.helpers.transcript_cache import transcript_cache, transcript_cache_key
+from app.logger import Logger
+
+logger_instance = Logger()
+logger = logger_instance.get_logger("upload_jobs")
+
+# Ordered processing stages; a job's `stage` column holds the last one completed.
+JOB_STAGES = ["saved", "audio_extracted", "transcribed", "indexed"]
+
+# Recorded as the owner of the jobs this process runs
+HOSTNAME = socket.gethostname()
+WORKER_ID = f"{HOSTNAME}:{os.getpid()}"
+
+
+def _owner_is_gone(owner: str) -> bool:
+    """True for an owner id of a dead process on this host, or of an earlier process with our pid."""
+    host, _, pid = (owner or "").rpartition(":")
+    if host != HOSTNAME or not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        return True  # pid reused after a restart (e.g. pid 1 in a container)
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+def stage_done(job, stage: str) -> bool:
+    return JOB_STAGES.index(job.stage) >= JOB_STAGES.index(stage)
+
+
+def job_to_dict(job) -> dict:
+    return {
+        "job_id": job.id,
+        "meeting_id": job.meeting_id,
+        "status": job.status,
+        "stage": job.stage,
+        "attempts": job.attempts or 0,
+        "error": job.error,
+        "stages": [{"name": name, "done": stage_done(job, name)} for name in JOB_STAGES],
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+
+
+def add_upload_job(db, meeting_id: int, file_path: str, ext: str, content_hash: str = None):
+    """
+    Records a saved upload on the meeting library and adds its processing job,
+    without committing. The caller commits and then calls `UploadJobQueue.enqueue`.
+    """
+    library = db.query(_models.MeetingLibrary).filter_by(meeting_id=meeting_id).first()
+    if not library:
+        library = _models.MeetingLibrary(meeting_id=meeting_id)
+        db.add(library)
+
+    if ext in ["mp3", "wav"]:
+        library.audio_path = file_path
+    elif ext == "mp4":
+        library.video_path = file_path
+
+    job = _models.UploadJob(
+        meeting_id=meeting_id,
+        file_path=file_path,
+        file_ext=ext,
+        content_hash=content_hash,
+        status="queued",
+        stage="saved"
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+def create_upload_job(db, meeting_id: int, file_path: str, ext: str, content_hash: str = None):
+    """Records a saved upload on the meeting library and queues its processing job."""
+    job = add_upload_job(db, meeting_id, file_path, ext, content_hash)
+    db.commit()
+    db.refresh(job)
+
+    UploadJobQueue.enqueue(job.id)
+    logger.info(f"Queued upload job {job.id} for meeting {meeting_id} ({os.path.basename(file_path)})")
+    return job
+
+
+def _advance(db, job, stage: str):
+    job.stage = stage
+    db.commit()
+    logger.info(f"Upload job {job.id} (meeting {job.meeting_id}) reached stage '{stage}'")
+
+
+def process_upload_job(job_id: int):
+    """
+    Runs the remaining stages of an upload job.
+
+    Stages that are already recorded as done are skipped, so a retried or
+    recovered job resumes where it stopped instead of transcribing again.
+    """
+    db = _database.SessionLocal()
+    try:
+        job = db.query(_models.UploadJob).get(job_id)
+        if job is None:
+            logger.warning(f"Upload job {job_id} no longer exists, skipping")
+            return
+
+        library = db.query(_models.MeetingLibrary).filter_by(meeting_id=job.meeting_id).first()
+        if not library:
+            library = _models.MeetingLibrary(meeting_id=job.meeting_id)
+            db.add(library)
+            db.commit()
+
+        # Reuse the transcript of identical media uploaded before
+        cache_key = transcript_cache_key(job.content_hash) if job.content_hash and job.file_ext != "txt" else None
+        cached_transcript = transcript_cache.get(cache_key) if cache_key and not stage_done(job, "transcribed") else None
+        if cached_transcript is not None:
+            logger.info(f"Upload job {job.id} reuses cached transcript for {job.content_hash}")
+
+        # 1. Audio track: video audio is decoded through an ffmpeg pipe during
+        # transcription, so there is no separate extraction step to wait for
+        if not stage_done(job, "audio_extracted"):
+            _advance(db, job, "audio_extracted")
+
+        # 2. Transcribe audio
+        if not stage_done(job, "transcribed"):
+            if job.file_ext == "txt":
+                library.transcript_path = job.file_path
+            else:
+                transcript_text = cached_transcript
+                if transcript_text is None:
+                    if job.file_ext == "mp4":
+                        transcript_text = transcribe_video(job.file_path)
+                    else:
+                        transcript_text = transcribe_audio(job.file_path)
+                    if cache_key:
+                        transcript_cache.put(cache_key, transcript_text)
+                transcript_path = job.file_path.rsplit(".", 1)[0] + "_transcript.txt"
+                with open(transcript_path, "w", encoding="utf-8") as f:
+                    f.write(transcript_text)
+                library.transcript_path = transcript_path
+            _advance(db, job, "transcribed")
+
+        # 3. Vector embedding call
+        if not stage_done(job, "indexed"):
+            HttpClients.run_sync(ingest_transcript(library.transcript_path, str(job.meeting_id)))
+            answer_cache.invalidate(job.meeting_id)
+            _advance(db, job, "indexed")
+
+        job.status = "completed"
+        job.error = None
+        db.commit()
+    finally:
+        db.close()
+
+
+class UploadJobQueue:
+    """
+    In-process worker pool for upload jobs.
+
+    Job state lives in the `upload_jobs` table; the in-memory queue only holds
+    ids. Jobs are claimed with a conditional UPDATE so that several API
+    processes sharing the database never run the same job twice.
+    """
+    _queue = queue.Queue()
+    _workers = []
+    _stop_event = threading.Event()
+    _monitor = None
+    _pending = set()  # ids on this process's queue or waiting on a retry timer
+    _running = set()  # ids of jobs claimed by this process
+    _ids_lock = threading.Lock()
+
+    @classmethod
+    def start(cls, num_workers: int = UPLOAD_JOB_WORKERS):
+        if cls._workers:
+            return
+
+        cls._stop_event.clear()
+        cls._recover_pending_jobs()
+
+        for i in range(max(1, num_workers)):
+            worker = threading.Thread(target=cls._worker_loop, name=f"upload-job-worker-{i}", daemon=True)
+            worker.start()
+            cls._workers.append(worker)
+
+        cls._monitor = threading.Thread(target=cls._monitor_loop, name="upload-job-monitor", daemon=True)
+        cls._monitor.start()
+
+        logger.info(f"Started {len(cls._workers)} upload job workers as {WORKER_ID}")
+
+    @classmethod
+    def stop(cls):
+        cls._stop_event.set()
+        for _ in cls._workers:
+            cls._queue.put(None)
+        for worker in cls._workers:
+            worker.join(timeout=5)
+        cls._workers = []
+        if cls._monitor is not None:
+            cls._monitor.join(timeout=5)
+            cls._monitor = None
+
+    @classmethod
+    def enqueue(cls, job_id: int, delay: float = 0):
+        """Queues a job unless this process already has it queued or scheduled."""
+        with cls._ids_lock:
+            if job_id in cls._pending:
+                return
+            cls._pending.add(job_id)
+
+        if delay > 0:
+            timer = threading.Timer(delay, cls._queue.put, args=(job_id,))
+            timer.daemon = True
+            timer.start()
+        else:
+            cls._queue.put(job_id)
+
+    @classmethod
+    def _recover_pending_jobs(cls):
+        # Re-queue jobs left over from a previous run: queued ones and running ones
+        # whose owner was this process's previous incarnation (or another dead
+        # process on this host). Jobs with a stale heartbeat are left to the monitor.
+        db = _database.SessionLocal()
+        try:
+            orphaned = [
+                job_id for job_id, owner in db.query(_models.UploadJob.id, _models.UploadJob.owner).filter(
+                    _models.UploadJob.status == "running",
+                    _models.UploadJob.owner.like(f"{HOSTNAME}:%")
+                ).all()
+                if _owner_is_gone(owner)
+            ]
+            if orphaned:
+                db.query(_models.UploadJob).filter(
+                    _models.UploadJob.id.in_(orphaned),
+                    _models.UploadJob.status == "running"
+                ).update({"status": "queued", "owner": None}, synchronize_session=False)
+                db.commit()
+                logger.info(f"Reclaimed {len(orphaned)} upload jobs left running by a previous process")
+
+            pending = db.query(_models.UploadJob.id).filter_by(status="queued").all()
+            for (job_id,) in pending:
+                cls.enqueue(job_id)
+
+            if pending:
+                logger.info(f"Recovered {len(pending)} pending upload jobs")
+        except Exception as e:
+            logger.error(f"Failed to recover pending upload jobs: {str(e)}")
+        finally:
+            db.close()
+
+    @classmethod
+    def _heartbeat(cls):
+        with cls._ids_lock:
+            running = list(cls._running)
+        if not running:
+            return
+
+        db = _database.SessionLocal()
+        try:
+            db.query(_models.UploadJob).filter(
+                _models.UploadJob.id.in_(running),
+                _models.UploadJob.owner == WORKER_ID
+            ).update({"heartbeat_at": _dt.datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    @classmethod
+    def _reclaim_stale_jobs(cls):
+        """Re-queues running jobs whose owner stopped sending heartbeats, in any process."""
+        db = _database.SessionLocal()
+        try:
+            stale_before = _dt.datetime.utcnow() - _dt.timedelta(seconds=UPLOAD_JOB_STALE_AFTER)
+            last_seen = _sql.func.coalesce(_models.UploadJob.heartbeat_at, _models.UploadJob.updated_at)
+            stale = [job_id for (job_id,) in db.query(_models.UploadJob.id).filter(
+                _models.UploadJob.status == "running",
+                last_seen < stale_before
+            ).all()]
+
+            for job_id in stale:
+                # Conditional per job, so only one scanning process re-queues it
+                reclaimed = db.query(_models.UploadJob).filter(
+                    _models.UploadJob.id == job_id,
+                    _models.UploadJob.status == "running",
+                    last_seen < stale_before
+                ).update({"status": "queued", "owner": None}, synchronize_session=False)
+                db.commit()
+                if reclaimed:
+                    logger.warning(f"Upload job {job_id} lost its heartbeat, re-queued")
+                    cls.enqueue(job_id)
+
+            # Retries scheduled by a process that has since died; `enqueue` skips
+            # jobs this process already has queued, such as ones waiting behind a backlog
+            for (job_id,) in db.query(_models.UploadJob.id).filter(
+                _models.UploadJob.status == "queued",
+                _models.UploadJob.updated_at < stale_before
+            ).all():
+                cls.enqueue(job_id)
+        finally:
+            db.close()
+
+    @classmethod
+    def _monitor_loop(cls):
+        while not cls._stop_event.wait(UPLOAD_JOB_HEARTBEAT_INTERVAL):
+            try:
+                cls._heartbeat()
+                cls._reclaim_stale_jobs()
+            except Exception as e:
+                logger.error(f"Upload job heartbeat failed: {str(e)}")
+
+    @classmethod
+    def _claim(cls, job_id: int) -> bool:
+        db = _database.SessionLocal()
+        try:
+            claimed = db.query(_models.UploadJob).filter_by(id=job_id, status="queued").update(
+                {
+                    "status": "running",
+                    "attempts": _models.UploadJob.attempts + 1,
+                    "owner": WORKER_ID,
+                    "heartbeat_at": _dt.datetime.utcnow(),
+                },
+                synchronize_session=False
+            )
+            db.commit()
+            if claimed == 1:
+                with cls._ids_lock:
+                    cls._running.add(job_id)
+            return claimed == 1
+        finally:
+            db.close()
+
+    @classmethod
+    def _record_failure(cls, job_id: int, error: Exception):
+        db = _database.SessionLocal()
+        try:
+            job = db.query(_models.UploadJob).get(job_id)
+            if job is None:
+                return
+
+            job.error = str(error)
+            if job.attempts < UPLOAD_JOB_MAX_ATTEMPTS:
+                job.status = "queued"
+                delay = UPLOAD_JOB_RETRY_DELAY * (2 ** (job.attempts - 1))
+                db.commit()
+                logger.warning(f"Upload job {job_id} failed at attempt {job.attempts}, retrying in {delay:.0f}s: {error}")
+                cls.enqueue(job_id, delay=delay)
+            else:
+                job.status = "failed"
+                db.commit()
+                logger.error(f"Upload job {job_id} failed after {job.attempts} attempts: {error}")
+        finally:
+            db.close()
+
+    @classmethod
+    def _worker_loop(cls):
+        while not cls._stop_event.is_set():
+            job_id = cls._queue.get()
+            if job_id is None:
+                break
+            with cls._ids_lock:
+                cls._pending.discard(job_id)
+
+            try:
+                if not cls._claim(job_id):
+                    continue
+                process_upload_job(job_id)
+            except Exception as e:
+                cls._record_failure(job_id, e)
+            finally:
+                with cls._ids_lock:
+                    cls._running.discard(job_id)
+                cls._queue.task_done()
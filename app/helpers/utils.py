@@ -1,12 +1,23 @@
-from app.helpers.constants import EMBEDDING_URL , RETRIVER_URL , OLLAMA_URL
+from app.helpers.constants import WHISPER_BATCH_SIZE , VAD_ENABLED , SUMMARY_BATCH_SIZE , SUMMARY_MAX_INPUT_TOKENS
+from app.helpers.constants import SUMMARY_HIERARCHICAL , SUMMARY_TARGET_TOKENS , SUMMARY_MAP_WORKERS , SUMMARY_MAX_REDUCE_ROUNDS , SENTIMENT_BATCH_SIZE
+from app.helpers.constants import MINUTES_SEGMENT_CHARS , MINUTES_CONCURRENCY , CHAT_SUMMARY_MAX_WORDS , CHAT_NUM_CTX
 from transformers import AutoProcessor, AutoModelForSpeechSeq2Seq , pipeline
+import asyncio
 import json
-import requests
-import torchaudio
+import math
+import re
+import zlib
+import httpx
 import torch
 import os
-from app.helpers.modelloader import ModelRegistry
-import math
+from app.helpers.modelloader import ModelRegistry, with_own_tokenizer
+from app.helpers.http_clients import HttpClients
+from app.helpers.executors import run_cpu_bound
+from app.helpers.summary_cache import summary_cache, summary_cache_key
+from app.helpers.sentiment_cache import sentiment_cache, normalize_line
+from app.helpers.transcription_pool import TranscriptionPool
+from app.helpers.vad import iter_speech_windows
+from app.helpers.audio_stream import iter_audio_blocks, iter_ffmpeg_pcm_blocks, iter_fixed_windows
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -17,46 +28,101 @@ import redis
 
 MAX_DURATION = 30  # seconds
 
-def transcribe_audio(file_path: str) -> str:
-    model = ModelRegistry.whisper_model
-    processor = ModelRegistry.whisper_processor
+def transcribe_audio(file_path: str, batch_size: int = WHISPER_BATCH_SIZE) -> str:
+    # Decode, resample and mix down block by block so memory stays flat for long recordings
+    return transcribe_stream(iter_audio_blocks(file_path), batch_size)
 
-    speech_array, sampling_rate = torchaudio.load(file_path)
 
-    # Resample to 16kHz
-    if sampling_rate != 16000:
-        resampler = torchaudio.transforms.Resample(orig_freq=sampling_rate, new_freq=16000)
-        speech_array = resampler(speech_array)
+def transcribe_video(file_path: str, batch_size: int = WHISPER_BATCH_SIZE) -> str:
+    # ffmpeg pipes the audio track as 16 kHz mono PCM; no intermediate audio file
+    return transcribe_stream(iter_ffmpeg_pcm_blocks(file_path), batch_size)
+
+
+def transcribe_stream(blocks, batch_size: int = WHISPER_BATCH_SIZE) -> str:
+    """
+    Transcribes a stream of 16 kHz mono float32 blocks.
 
-    # Convert stereo to mono
-    if speech_array.shape[0] > 1:
-        speech_array = torch.mean(speech_array, dim=0, keepdim=True)
+    Args:
+        blocks (Iterable[np.ndarray]): Consecutive waveform blocks of any length.
+        batch_size (int): Windows per generate() call.
 
-    waveform = speech_array.squeeze(0)
-    chunk_size = MAX_DURATION * 16000  # samples per chunk
-    total_samples = waveform.shape[0]
-    num_chunks = math.ceil(total_samples / chunk_size)
+    Returns:
+        str: Transcript with one line per decoded window.
+    """
+    if VAD_ENABLED:
+        # Only decode speech; windows end at pauses instead of fixed offsets
+        windows = iter_speech_windows(blocks, 16000, MAX_DURATION)
+    else:
+        windows = iter_fixed_windows(blocks, MAX_DURATION * 16000)
 
-    transcription = ""
+    texts = transcribe_windows(windows, batch_size)
+    return "\n".join(texts).strip()
 
-    for i in range(num_chunks):
-        start = i * chunk_size
-        end = min(start + chunk_size, total_samples)
-        chunk = waveform[start:end]
 
-        input_features = processor(
-            chunk.numpy(),
-            sampling_rate=16000,
-            return_tensors="pt"
-        ).input_features
+def _iter_batches(items, batch_size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
-        with torch.no_grad():
-            predicted_ids = model.generate(input_features)
 
-        text = processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
-        transcription += text + "\n"
+def transcribe_windows(windows, batch_size: int = WHISPER_BATCH_SIZE):
+    """
+    Transcribes a stream of audio windows, batch by batch as they become ready.
 
-    return transcription.strip()
+    Args:
+        windows (Iterable[np.ndarray]): 16 kHz mono windows, at most MAX_DURATION seconds each.
+        batch_size (int): Windows per generate() call.
+
+    Returns:
+        List[str]: One transcription per window, in order.
+    """
+    batch_size = max(1, batch_size)
+
+    if TranscriptionPool.is_running():
+        # Smaller batches so shorter recordings still spread over every worker
+        pool_batch_size = max(1, batch_size // TranscriptionPool.num_workers())
+        return TranscriptionPool.transcribe_batches(_iter_batches(windows, pool_batch_size))
+
+    texts = []
+    with ModelRegistry.use("whisper") as (processor, model):
+        for batch in _iter_batches(windows, batch_size):
+            texts.extend(transcribe_chunks(batch, model, processor))
+    return texts
+
+
+def transcribe_chunks(chunks, model, processor):
+    """
+    Runs Whisper over a batch of 16 kHz mono chunks in a single generate() call.
+
+    The feature extractor pads every chunk (including a short final one) to the
+    30 s window Whisper expects, so chunks of different lengths can share a batch.
+
+    Args:
+        chunks (List[np.ndarray]): Audio chunks, at most MAX_DURATION seconds each.
+        model: Whisper seq2seq model.
+        processor: Matching Whisper processor.
+
+    Returns:
+        List[str]: One transcription per chunk, in the same order as the input.
+    """
+    if not chunks:
+        return []
+
+    input_features = processor(
+        chunks,
+        sampling_rate=16000,
+        return_tensors="pt"
+    ).input_features
+
+    with torch.no_grad():
+        predicted_ids = model.generate(input_features.to(model.dtype))
+
+    return processor.batch_decode(predicted_ids, skip_special_tokens=True)
 
 def chunk_text(text, max_chars=1000):
     paragraphs = text.split("\n")
@@ -73,36 +139,275 @@ def chunk_text(text, max_chars=1000):
         chunks.append(chunk.strip())
     return chunks
 
-def summarize_text(text: str) -> str:
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
 
-    summarizer = ModelRegistry.summarizer
-    if summarizer is None:
-        raise ValueError("Summarizer model not loaded")
 
-    chunks = chunk_text(text)
-    summary_parts = []
+def segment_transcript(text, max_chars: int = MINUTES_SEGMENT_CHARS):
+    """
+    Packs transcript paragraphs into segments of at most `max_chars` characters.
 
-    for chunk in chunks:
-        if not chunk.strip():
+    Unlike `chunk_text`, a paragraph longer than a segment (Whisper transcripts
+    are often a single line) is split at sentence boundaries, and a single
+    overlong sentence at `max_chars`.
+    """
+    pieces = []
+    for para in text.split("\n"):
+        para = para.strip()
+        if not para:
+            continue
+        if len(para) <= max_chars:
+            pieces.append(para)
             continue
+        for sentence in SENTENCE_BOUNDARY.split(para):
+            windows = (sentence[start:start + max_chars].strip() for start in range(0, len(sentence), max_chars))
+            pieces.extend(window for window in windows if window)
+
+    segments, current = [], ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            segments.append(current)
+            current = piece
+        else:
+            current = f"{current}\n{piece}" if current else piece
+    if current:
+        segments.append(current)
+    return segments
 
-        input_len = len(chunk.split())
-        max_len = min(130, int(input_len * 0.8))
-        min_len = max(30, int(max_len * 0.5))
 
-        try:
-            result = summarizer(
-                chunk,
-                max_length=max_len,
-                min_length=min_len,
-                do_sample=False
-            )
-            summary_parts.append(result[0]["summary_text"])
-        except Exception as e:
-            summary_parts.append(f"[Summary error]: {str(e)}")
+
+def chunk_text_by_tokens(text, tokenizer, max_tokens: int = SUMMARY_MAX_INPUT_TOKENS):
+    """
+    Packs paragraphs into chunks that fill the summarizer's input window.
+
+    Sizes are counted with the model's own tokenizer, so chunks come out close
+    to the real limit instead of a conservative character estimate. A paragraph
+    that is too long on its own is split at sentence boundaries, and a single
+    overlong sentence is split on token boundaries, so nothing gets truncated.
+    Chunk boundaries depend on the surrounding paragraphs only, not on everything
+    before them, so editing one part of a transcript leaves the other chunks as they were.
+
+    Args:
+        text (str): Transcript text, one paragraph per line.
+        tokenizer: Tokenizer of the summarization model.
+        max_tokens (int): Upper bound per chunk, capped at the model's own limit.
+
+    Returns:
+        List[str]: Non-empty chunks, in transcript order.
+    """
+    limit = min(max_tokens, tokenizer.model_max_length) - tokenizer.num_special_tokens_to_add()
+    paragraphs = [para.strip() for para in text.split("\n") if para.strip()]
+    if not paragraphs:
+        return []
+
+    # Split oversized paragraphs into pieces that fit on their own
+    pieces = []
+    lengths = [len(ids) for ids in tokenizer(paragraphs, add_special_tokens=False)["input_ids"]]
+    for para, length in zip(paragraphs, lengths):
+        if length <= limit:
+            pieces.append((para, length))
+            continue
+
+        sentences = [sentence for sentence in SENTENCE_BOUNDARY.split(para) if sentence]
+        sentence_ids = tokenizer(sentences, add_special_tokens=False)["input_ids"]
+        for sentence, ids in zip(sentences, sentence_ids):
+            if len(ids) <= limit:
+                pieces.append((sentence, len(ids)))
+            else:
+                for start in range(0, len(ids), limit):
+                    window = ids[start:start + limit]
+                    pieces.append((tokenizer.decode(window), len(window)))
+
+    # Pack pieces up to content-defined boundaries: a chunk ends after an anchor
+    # piece once it is half full, or before a piece that would overflow it. An
+    # edit then only moves boundaries up to the next anchor, so the chunks after
+    # it (and their cached summaries) stay the same. +1 is the newline token.
+    chunks = []
+    current, current_len = [], 0
+    for piece, length in pieces:
+        if current and current_len + 1 + length > limit:
+            chunks.append("\n".join(current))
+            current, current_len = [], 0
+        current.append(piece)
+        current_len += length + (1 if current_len else 0)
+        if current_len >= limit // 2 and _is_chunk_anchor(piece, length, limit):
+            chunks.append("\n".join(current))
+            current, current_len = [], 0
+    if current:
+        chunks.append("\n".join(current))
+
+    return chunks
+
+
+def _is_chunk_anchor(piece: str, length: int, limit: int) -> bool:
+    """Picks anchors from the piece text alone, on average one per `limit // 2` tokens."""
+    return zlib.crc32(piece.encode("utf-8")) % max(1, limit // 2) < length
+
+
+def summarize_text(text: str, batch_size: int = SUMMARY_BATCH_SIZE) -> str:
+
+    with ModelRegistry.use("summarizer") as summarizer:
+        summarizer = with_own_tokenizer(summarizer)
+        chunks = chunk_text_by_tokens(text, summarizer.tokenizer)
+        summary_parts = summarize_chunks(summarizer, chunks, batch_size)
 
     return "\n".join(summary_parts).strip()
 
+
+async def summarize_transcript(text: str, batch_size: int = SUMMARY_BATCH_SIZE, hierarchical: bool = SUMMARY_HIERARCHICAL) -> str:
+    """Summarizes a transcript on the bounded CPU executor, flat or map-reduce."""
+    if hierarchical:
+        return await hierarchical_summarize(text, batch_size)
+    return await run_cpu_bound(summarize_text, text, batch_size)
+
+
+def _summarize_slice(chunks, batch_size: int):
+    # Slices run in parallel executor threads, each with its own tokenizer
+    with ModelRegistry.use("summarizer") as summarizer:
+        return summarize_chunks(with_own_tokenizer(summarizer), chunks, batch_size)
+
+
+def _summary_chunks(text: str, fit_tokens: int = None):
+    """Chunks `text` for the summarizer, or returns None when it already fits in `fit_tokens`."""
+    with ModelRegistry.use("summarizer") as summarizer:
+        tokenizer = with_own_tokenizer(summarizer).tokenizer
+        if fit_tokens is not None and len(tokenizer(text, add_special_tokens=False)["input_ids"]) <= fit_tokens:
+            return None
+        return chunk_text_by_tokens(text, tokenizer)
+
+
+async def summarize_chunks_parallel(chunks, batch_size: int = SUMMARY_BATCH_SIZE, workers: int = SUMMARY_MAP_WORKERS):
+    """
+    Runs `summarize_chunks` over contiguous slices of `chunks`, keeping order.
+
+    Each slice is a separate task on the bounded CPU executor, so the
+    executor's worker count caps concurrent inference across all requests
+    instead of every request adding threads of its own.
+    """
+    if not chunks:
+        return []
+    workers = max(1, min(workers, len(chunks)))
+    size = math.ceil(len(chunks) / workers)
+    slices = [chunks[start:start + size] for start in range(0, len(chunks), size)]
+    results = await asyncio.gather(*(run_cpu_bound(_summarize_slice, part, batch_size) for part in slices))
+    return [summary for part in results for summary in part]
+
+
+async def hierarchical_summarize(
+    text: str,
+    batch_size: int = SUMMARY_BATCH_SIZE,
+    target_tokens: int = SUMMARY_TARGET_TOKENS,
+    workers: int = SUMMARY_MAP_WORKERS,
+    max_rounds: int = SUMMARY_MAX_REDUCE_ROUNDS,
+) -> str:
+    """
+    Map-reduce summarization with a bounded result length.
+
+    Map: every chunk is summarized, `workers` slices in parallel. Reduce: the
+    chunk summaries are joined, re-chunked and summarized again until the joined
+    text fits in `target_tokens`. Short transcripts whose chunk summaries already
+    fit come back after the map stage, the same as flat summarization.
+
+    Returns:
+        str: Summary of at most roughly `target_tokens` tokens.
+    """
+    chunks = await run_cpu_bound(_summary_chunks, text)
+    summaries = await summarize_chunks_parallel(chunks, batch_size, workers)
+
+    # Failed chunks of every round are reported once at the end, not fed into the next round
+    errors = []
+    for _ in range(max_rounds):
+        errors += [summary for summary in summaries if summary.startswith("[Summary error]")]
+        parts = [summary for summary in summaries if not summary.startswith("[Summary error]")]
+        combined = "\n".join(parts).strip()
+        chunks = await run_cpu_bound(_summary_chunks, combined, target_tokens) if parts else None
+        if not chunks:
+            return "\n".join(parts + errors).strip()
+
+        summaries = await summarize_chunks_parallel(chunks, batch_size, workers)
+        if len(chunks) == 1:
+            # Fits the model but not the target: this was the last pass
+            if summaries[0].startswith("[Summary error]"):
+                return "\n".join(parts + errors + summaries).strip()
+            return "\n".join(summaries + errors).strip()
+
+    return "\n".join(summaries + errors).strip()
+
+
+def summary_lengths(chunk: str):
+    input_len = len(chunk.split())
+    max_len = min(130, int(input_len * 0.8))
+    min_len = max(30, int(max_len * 0.5))
+    return max_len, min_len
+
+
+def summarize_chunks(summarizer, chunks, batch_size: int = SUMMARY_BATCH_SIZE):
+    """
+    Summarizes chunks in batches, keeping each chunk's own length limits.
+
+    Chunks are grouped by their (max_length, min_length) pair, since a pipeline
+    call shares generation settings across its batch, and sorted by length
+    inside each group so batches carry little padding. If a batch fails, its
+    chunks are retried one at a time so only the failing chunk reports an error.
+
+    Summaries are cached per chunk, so re-summarizing an edited transcript only
+    runs inference on the chunks whose text changed.
+
+    Args:
+        summarizer: Summarization pipeline.
+        chunks (List[str]): Non-empty transcript chunks.
+        batch_size (int): Chunks per pipeline call.
+
+    Returns:
+        List[str]: One summary (or "[Summary error]: ..." message) per chunk, in input order.
+    """
+    batch_size = max(1, batch_size)
+    summaries = [None] * len(chunks)
+    keys = [None] * len(chunks)
+
+    groups = {}
+    for index, chunk in enumerate(chunks):
+        lengths = summary_lengths(chunk)
+        keys[index] = summary_cache_key(chunk, *lengths)
+        summaries[index] = summary_cache.get(keys[index])
+        if summaries[index] is None:
+            groups.setdefault(lengths, []).append(index)
+
+    for (max_len, min_len), indices in groups.items():
+        indices.sort(key=lambda index: len(chunks[index]))
+
+        for start in range(0, len(indices), batch_size):
+            batch = indices[start:start + batch_size]
+            try:
+                results = summarizer(
+                    [chunks[index] for index in batch],
+                    max_length=max_len,
+                    min_length=min_len,
+                    do_sample=False,
+                    truncation=True,
+                    batch_size=len(batch)
+                )
+                for index, result in zip(batch, results):
+                    summaries[index] = result["summary_text"]
+            except Exception:
+                for index in batch:
+                    try:
+                        result = summarizer(
+                            chunks[index],
+                            max_length=max_len,
+                            min_length=min_len,
+                            do_sample=False,
+                            truncation=True
+                        )
+                        summaries[index] = result[0]["summary_text"]
+                    except Exception as e:
+                        summaries[index] = f"[Summary error]: {str(e)}"
+
+            for index in batch:
+                if not summaries[index].startswith("[Summary error]"):
+                    summary_cache.put(keys[index], summaries[index])
+
+    return summaries
+
 # def summarize_text(text: str, max_chunk_length: int = 1024) -> str:
 #     if not text.strip():
 #         return "Transcript is empty."
@@ -130,34 +435,23 @@ def summarize_text(text: str) -> str:
 
 
 
-def get_embedding(text, url = EMBEDDING_URL):
-    headers = {
-        "Content-Type": "application/json"
-    }
+async def get_embedding(text):
     payload = {
         "inputs": [text]
     }
 
     try:
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
-        response.raise_for_status()  # Raise error for bad responses (4xx or 5xx)
+        response = await HttpClients.get("embedding").post(json=payload)
 
         embedding = response.json()
         return embedding  # Usually a list of vectors, e.g., [[0.123, 0.456, ...]]
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"Error communicating with embedding service: {e}")
         return None
 
 
 
-def retrieve_similar_documents(text, embedding, index_name, k=4, search_type="similarity", url=RETRIVER_URL):
-    if url is None:
-        raise ValueError("Retrieval URL must be provided")
-
-    headers = {
-        "Content-Type": "application/json"
-    }
-
+async def retrieve_similar_documents(text, embedding, index_name, k=4, search_type="similarity"):
     payload = {
         "text": text,
         "embedding": embedding,  # API expects a 2D list
@@ -167,18 +461,30 @@ def retrieve_similar_documents(text, embedding, index_name, k=4, search_type="si
     }
 
     try:
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
-        response.raise_for_status()
+        response = await HttpClients.get("retriever").post(json=payload)
         data = response.json()
 
         # Extract only the text fields from retrieved_docs
         return data.get("retrieved_docs", [])
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"Error in retrieval request: {e}")
         return []
 
 
+async def ingest_transcript(transcript_path, index_name):
+    """Uploads a transcript to the dataprep service, which chunks and indexes it."""
+    with open(transcript_path, "rb") as f:
+        content = f.read()
+    files = {"files": (os.path.basename(transcript_path), content)}
+    data = {
+        "index_name": index_name,
+        "chunk_size": "500",
+        "chunk_overlap": "200"
+    }
+    await HttpClients.get("dataprep").post(files=files, data=data)
+
+
 def build_qa_prompt(question, context_chunks):
     context_text = "\n\n---\n\n".join(chunk["text"] for chunk in context_chunks)
     prompt = (
@@ -192,6 +498,43 @@ def build_qa_prompt(question, context_chunks):
 
 
 
+def build_chat_prompt(question, context_chunks, summary=None, first_turn=True):
+    """
+    Prompt for one turn of a meeting chat session.
+
+    Earlier turns are carried by Ollama's context tokens, so a follow-up only
+    adds the passages retrieved for the new question. After the context was
+    compressed, the conversation summary stands in for the earlier turns.
+    """
+    context_text = "\n\n---\n\n".join(chunk["text"] for chunk in context_chunks)
+    parts = []
+    if first_turn:
+        parts.append(
+            "You are a helpful assistant in a conversation about a meeting. Use the extracted passages "
+            "from the meeting transcript and the conversation so far to answer each question as accurately "
+            "as possible, in one or two concise sentences."
+        )
+    if summary:
+        parts.append(f"Conversation so far (summary):\n{summary}")
+    parts.append(f"Context:\n{context_text}")
+    parts.append(f"Question: {question}\n\nAnswer:")
+    return "\n\n".join(parts)
+
+
+def chat_summary_prompt(summary, turns, max_words=CHAT_SUMMARY_MAX_WORDS):
+    """Prompt that folds recent chat turns into the rolling conversation summary."""
+    transcript = "\n".join(f"Q: {turn['question']}\nA: {turn['answer']}" for turn in turns)
+    previous = f"Summary of the earlier conversation:\n{summary}\n\n" if summary else ""
+    return (
+        "Summarize this conversation about a meeting so that it can be continued later. "
+        "Keep the facts, names, numbers and open questions that follow-up questions may refer to. "
+        f"Use at most {max_words} words.\n\n"
+        f"{previous}"
+        f"Recent turns:\n{transcript}\n\n"
+        "Summary:"
+    )
+
+
 def meeting_minutes_prompt(context_chunks):
     CONTEXT = (
         "You are a team assistant and support the team with its daily work.\n"
@@ -220,7 +563,120 @@ def meeting_minutes_prompt(context_chunks):
     )
 
     return prompt
-import re
+def segment_minutes_prompt(segment: str, index: int, total: int):
+    """Prompt for the partial minutes of one transcript segment (map step)."""
+    return (
+        "You are a team assistant and support the team with its daily work.\n\n"
+        f"Below is part {index + 1} of {total} of a meeting transcript. Extract only what this part contains.\n"
+        "Answer with exactly these sections, each title on its own line, items as '- ' bullets on consecutive lines, "
+        "and one blank line between sections. Write 'None' if a section is empty.\n"
+        "**Summary:** two or three sentences on what was discussed\n"
+        "**Decisions:** decisions that were made\n"
+        "**Action Items:** tasks with assignees and deadlines if mentioned\n"
+        "**Additional Notes:** other important discussion points\n\n"
+        "Transcript part:\n"
+        f"{segment}\n\n"
+        "Partial meeting minutes:\n"
+    )
+
+
+def _partial_minutes_notes(partials) -> str:
+    parts = []
+    for index, partial in enumerate(partials, 1):
+        parts.append(
+            f"Part {index}:\n"
+            f"Summary: {partial['summary']}\n"
+            f"Decisions:\n{partial['decisions']}\n"
+            f"Action Items:\n{partial['action_items']}\n"
+            f"Additional Notes:\n{partial['additional_notes']}"
+        )
+    return "\n\n---\n\n".join(parts)
+
+
+def merge_minutes_prompt(partials):
+    """Prompt that merges per-segment partial minutes into the final minutes (reduce step)."""
+    notes = _partial_minutes_notes(partials)
+
+    return (
+        "You are a team assistant and support the team with its daily work.\n\n"
+        "The notes below were taken from consecutive parts of one meeting. Combine them into the final meeting minutes: "
+        "merge duplicates, drop 'None' entries and keep the chronological order.\n"
+        "Use exactly these sections, each title on its own line, items as '- ' bullets on consecutive lines, "
+        "and one blank line between sections:\n"
+        "**Summary:** a brief summary of the overall meeting\n"
+        "**Decisions:**\n"
+        "**Action Items:** including assignees and deadlines if mentioned\n"
+        "**Additional Notes:**\n\n"
+        f"Notes:\n{notes}\n\n"
+        "Generate the meeting minutes below:\n"
+        "**Meeting Minutes:**\n"
+    )
+
+
+async def map_meeting_minutes(transcript_text: str, concurrency: int = MINUTES_CONCURRENCY, max_chars: int = MINUTES_SEGMENT_CHARS):
+    """
+    Map step of chunked minutes generation.
+
+    The transcript is split into segments that fit the LLM's context, and
+    each segment's partial minutes are generated with up to `concurrency`
+    Ollama requests in flight.
+
+    Returns:
+        List[dict]: `parse_meeting_minutes` sections per segment, in transcript order.
+    """
+    segments = segment_transcript(transcript_text, max_chars)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def partial_minutes(index, segment):
+        async with semaphore:
+            raw = await generate_llm_answer(segment_minutes_prompt(segment, index, len(segments)))
+        return parse_meeting_minutes(raw)
+
+    return await asyncio.gather(*(partial_minutes(index, segment) for index, segment in enumerate(segments)))
+
+
+def group_partial_minutes(partials, max_chars: int = MINUTES_SEGMENT_CHARS):
+    """Splits consecutive partial minutes into groups whose merge notes fit in `max_chars`."""
+    groups, current = [], []
+    for partial in partials:
+        if current and len(_partial_minutes_notes(current + [partial])) > max_chars:
+            groups.append(current)
+            current = []
+        current.append(partial)
+    if current:
+        groups.append(current)
+    return groups
+
+
+async def reduce_meeting_minutes(partials, concurrency: int = MINUTES_CONCURRENCY, max_chars: int = MINUTES_SEGMENT_CHARS):
+    """
+    Reduce step of chunked minutes generation.
+
+    While the partial minutes are too long for one merge prompt, consecutive
+    partials are merged in groups that fit `max_chars`, round after round,
+    with up to `concurrency` Ollama requests in flight.
+
+    Returns:
+        str: Prompt merging the remaining partials into the final minutes.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def merge(group):
+        if len(group) == 1:
+            return group[0]
+        async with semaphore:
+            raw = await generate_llm_answer(merge_minutes_prompt(group))
+        return parse_meeting_minutes(raw)
+
+    while len(partials) > 1 and len(_partial_minutes_notes(partials)) > max_chars:
+        groups = group_partial_minutes(partials, max_chars)
+        if len(groups) == len(partials):
+            break  # every partial fills a prompt on its own; grouping cannot shrink them further
+        partials = await asyncio.gather(*(merge(group) for group in groups))
+
+    return merge_minutes_prompt(partials)
+
+
 def parse_meeting_minutes(raw_text: str) -> dict:
     sections = {
         "summary": "",
@@ -245,15 +701,13 @@ def parse_meeting_minutes(raw_text: str) -> dict:
 
 
 
-def generate_llm_answer(prompt, model="gemma2:2b", stream=False):
-    url = OLLAMA_URL
+async def generate_llm_answer(prompt, model="gemma2:2b"):
     payload = {
         "model": model,
         "prompt": prompt,
-        "stream": stream
+        "stream": False
     }
-    resp = requests.post(url, json=payload)
-    resp.raise_for_status()
+    resp = await HttpClients.get("ollama").post(json=payload)
     
     data = resp.json()
     if "response" not in data:
@@ -262,62 +716,192 @@ def generate_llm_answer(prompt, model="gemma2:2b", stream=False):
     return data["response"]
 
 
+async def generate_llm_turn(prompt, context=None, model="gemma2:2b", num_ctx: int = CHAT_NUM_CTX):
+    """
+    One conversation turn: continues from Ollama's `context` tokens of the
+    previous turn, so only the new prompt is evaluated. `num_ctx` is sent
+    explicitly so the window the session is compressed against is the one
+    the model actually runs with.
+
+    Returns:
+        Tuple[str, List[int]]: The answer and the context to send with the next turn.
+    """
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": False,
+        "options": {"num_ctx": num_ctx}
+    }
+    if context:
+        payload["context"] = context
+    resp = await HttpClients.get("ollama").post(json=payload)
+
+    data = resp.json()
+    if "response" not in data:
+        raise ValueError(f"Unexpected response format: {data}")
+
+    return data["response"], data.get("context") or []
+
+
+async def stream_llm_answer(prompt, model="gemma2:2b"):
+    """
+    Streams an Ollama completion, yielding response text pieces as they arrive.
+
+    Ollama sends one JSON object per line; the last one has "done": true.
+    """
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": True
+    }
+    async with HttpClients.get("ollama").stream(json=payload) as resp:
+        async for raw_line in resp.aiter_lines():
+            if not raw_line:
+                continue
+            data = json.loads(raw_line)
+            if "error" in data:
+                raise ValueError(f"Ollama error: {data['error']}")
+            if data.get("response"):
+                yield data["response"]
+            if data.get("done"):
+                break
+
+
 
-def answer_question(question, embedding, index_name):
+async def answer_question(question, embedding, index_name):
     # a) Get context
-    contexts = retrieve_similar_documents(question, embedding, index_name)
+    contexts = await retrieve_similar_documents(question, embedding, index_name)
     # b) Build prompt
     prompt = build_qa_prompt(question, contexts)
     # c) Generate answer
-    answer = generate_llm_answer(prompt)
+    answer = await generate_llm_answer(prompt)
     return answer
 
 
 
 
-def analyze_sentiment(lines):
+def analyze_sentiment(lines, batch_size: int = SENTIMENT_BATCH_SIZE):
     """
     Analyzes the sentiment of each line in a list of strings, safely handling long inputs.
 
+    Lines seen before (in this or any other meeting) are answered from the
+    sentiment cache, and repeated lines are classified once per call. The rest
+    are tokenized once (truncated to the model's limit), sorted into length
+    buckets and classified in padded batches, then mapped back to their
+    original order. If a batch fails, its lines are retried one at a time so
+    only the failing line reports an error.
+
     Args:
         lines (List[str]): List of transcript lines or sentences.
+        batch_size (int): Lines per forward pass.
 
     Returns:
         List[Dict]: A list of dictionaries with line, sentiment label, and confidence score.
     """
-    if ModelRegistry.sentiment_analyzer is None:
-        raise ValueError("Sentiment analyzer model not loaded.")
+    lines = [line for line in lines if line.strip()]  # Skip empty lines
+    if not lines:
+        return []
 
-    tokenizer = ModelRegistry.sentiment_analyzer.tokenizer
-    max_length = tokenizer.model_max_length
+    results = [None] * len(lines)
+    uncached = {}  # normalized line -> indices still to classify
+    for index, (line, cached) in enumerate(zip(lines, sentiment_cache.get_many(lines))):
+        if cached is not None:
+            label, score = cached
+            results[index] = {"line": line, "label": label, "score": score}
+        else:
+            uncached.setdefault(normalize_line(line), []).append(index)
+
+    if uncached:
+        unique = [lines[indices[0]] for indices in uncached.values()]
+        with ModelRegistry.use("sentiment_analyzer") as sentiment_analyzer:
+            classified = _classify_lines(sentiment_analyzer, unique, batch_size)
+
+        new_entries = {}
+        for line, result, indices in zip(unique, classified, uncached.values()):
+            # Truncated lines report the text the model saw and are not cached
+            if result["label"] != "error" and result["line"] == line:
+                new_entries[line] = (result["label"], result["score"])
+            for index in indices:
+                results[index] = dict(result, line=lines[index]) if result["line"] == line else result
+        sentiment_cache.put_many(new_entries)
+
+    return results
 
-    results = []
-    for line in lines:
-        if not line.strip():
-            continue  # Skip empty lines
 
+def _classify_lines(sentiment_analyzer, lines, batch_size: int = SENTIMENT_BATCH_SIZE):
+    tokenizer = sentiment_analyzer.tokenizer
+    max_length = tokenizer.model_max_length
+
+    results = [None] * len(lines)
+    encodings = [None] * len(lines)
+    try:
+        for index, input_ids in enumerate(tokenizer(lines, truncation=True, max_length=max_length)["input_ids"]):
+            encodings[index] = input_ids
+    except Exception:
+        for index, line in enumerate(lines):
+            try:
+                encodings[index] = tokenizer(line, truncation=True, max_length=max_length)["input_ids"]
+            except Exception as e:
+                results[index] = _sentiment_error(line, e)
+
+    pending = sorted((index for index in range(len(lines)) if encodings[index] is not None), key=lambda index: len(encodings[index]))
+    batch_size = max(1, batch_size)
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
         try:
-            # Truncate line if too long
-            tokens = tokenizer.encode(line, truncation=True, max_length=max_length)
-            truncated_line = tokenizer.decode(tokens, skip_special_tokens=True)
-
-            result = ModelRegistry.sentiment_analyzer(truncated_line)[0]
-            results.append({
-                "line": truncated_line,
-                "label": result['label'],
-                "score": round(result['score'], 3)
-            })
-        except Exception as e:
-            results.append({
+            predictions = _classify_encodings(sentiment_analyzer, [encodings[index] for index in batch])
+        except Exception:
+            predictions = []
+            for index in batch:
+                try:
+                    predictions.extend(_classify_encodings(sentiment_analyzer, [encodings[index]]))
+                except Exception as e:
+                    predictions.append(e)
+
+        for index, prediction in zip(batch, predictions):
+            if isinstance(prediction, Exception):
+                results[index] = _sentiment_error(lines[index], prediction)
+                continue
+
+            label, score = prediction
+            line = lines[index]
+            if len(encodings[index]) >= max_length:
+                # Report the text the model actually saw
+                line = tokenizer.decode(encodings[index], skip_special_tokens=True)
+            results[index] = {
                 "line": line,
-                "label": "error",
-                "score": 0.0,
-                "error": str(e)
-            })
+                "label": label,
+                "score": round(score, 3)
+            }
 
     return results
 
 
+def _classify_encodings(sentiment_analyzer, encodings):
+    """Runs one padded forward pass over token id lists; returns (label, score) pairs."""
+    model = sentiment_analyzer.model
+    inputs = sentiment_analyzer.tokenizer.pad({"input_ids": encodings}, padding=True, return_tensors="pt")
+    inputs = {name: tensor.to(model.device) for name, tensor in inputs.items()}
+
+    with torch.inference_mode():
+        probabilities = model(**inputs).logits.float().softmax(dim=-1)
+    scores, label_ids = probabilities.max(dim=-1)
+
+    return [
+        (model.config.id2label[label_id], score)
+        for label_id, score in zip(label_ids.tolist(), scores.tolist())
+    ]
+
+
+def _sentiment_error(line: str, error: Exception) -> dict:
+    return {
+        "line": line,
+        "label": "error",
+        "score": 0.0,
+        "error": str(error)
+    }
+
+
 
 
 
@@ -344,19 +928,29 @@ class MeetingCleanup:
             print(f"❌ Error deleting keys: {e}")
             return 0
 
-    def delete_all_meeting_files(self, library_entry) -> list:
+    def meeting_file_paths(self, library_entry) -> list:
         """
-        Delete all file paths stored in the MeetingLibrary model entry.
+        All file paths stored in the MeetingLibrary model entry.
         """
-        deleted_files = []
+        paths = []
         if library_entry:
             for column in library_entry.__table__.columns:
                 if 'path' in column.name:
                     path = getattr(library_entry, column.name)
-                    if path and os.path.exists(path):
-                        try:
-                            os.remove(path)
-                            deleted_files.append(path)
-                        except Exception as e:
-                            print(f"Failed to delete file {path}: {str(e)}")
+                    if path:
+                        paths.append(path)
+        return paths
+
+    def delete_all_meeting_files(self, paths) -> list:
+        """
+        Delete the given meeting files, skipping ones that no longer exist.
+        """
+        deleted_files = []
+        for path in paths:
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                    deleted_files.append(path)
+                except Exception as e:
+                    print(f"Failed to delete file {path}: {str(e)}")
         return deleted_files
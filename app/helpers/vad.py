@@ -0,0 +1,177 @@
+import numpy as np
+
+from app.helpers.constants import (
+    VAD_FRAME_MS,
+    VAD_NOISE_MARGIN_DB,
+    VAD_MIN_ENERGY_DB,
+    VAD_MIN_SILENCE_MS,
+    VAD_MIN_SPEECH_MS,
+    VAD_PAD_MS,
+)
+
+# Frames louder than this always count as speech, however noisy the floor estimate is
+_MAX_THRESHOLD_DB = -30.0
+# When a speech region is longer than one window, look for the quietest frame
+# in the last SPLIT_SEARCH_SECONDS of the window and cut there
+SPLIT_SEARCH_SECONDS = 8
+
+
+def frame_energy_db(waveform: np.ndarray, frame_len: int) -> np.ndarray:
+    """Mean power per frame in dB; the last partial frame is zero-padded."""
+    num_frames = int(np.ceil(len(waveform) / frame_len))
+    padded = np.zeros(num_frames * frame_len, dtype=np.float32)
+    padded[:len(waveform)] = waveform
+    frames = padded.reshape(num_frames, frame_len)
+    return 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+
+def _runs(mask: np.ndarray):
+    """Start (inclusive) and end (exclusive) indices of each run of True values."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_speech_regions(waveform: np.ndarray, sample_rate: int = 16000, energy_db: np.ndarray = None) -> np.ndarray:
+    """
+    Energy-based voice activity detection.
+
+    A frame is speech when its energy is a margin above the recording's noise
+    floor (10th percentile of frame energy). When the loud frames (90th
+    percentile) are less than that margin above the floor there is no floor to
+    speak of, and every frame above VAD_MIN_ENERGY_DB counts. Pauses shorter than
+    VAD_MIN_SILENCE_MS are bridged, blips shorter than VAD_MIN_SPEECH_MS are
+    dropped and the remaining regions are padded by VAD_PAD_MS on both sides.
+
+    Args:
+        waveform (np.ndarray): Mono float waveform.
+        sample_rate (int): Sampling rate of the waveform.
+        energy_db (np.ndarray): Precomputed frame energies, if already available.
+
+    Returns:
+        np.ndarray: (N, 2) array of [start, end) sample offsets, in order.
+    """
+    frame_len = int(sample_rate * VAD_FRAME_MS / 1000)
+    if energy_db is None:
+        energy_db = frame_energy_db(waveform, frame_len)
+    if energy_db.size == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    noise_floor, loud = np.percentile(energy_db, [10, 90])
+    if loud - noise_floor < VAD_NOISE_MARGIN_DB:
+        # No quiet stretch to measure a floor against (continuous speech or a
+        # steady quiet signal): everything audible counts as speech
+        threshold = VAD_MIN_ENERGY_DB
+    else:
+        threshold = np.clip(noise_floor + VAD_NOISE_MARGIN_DB, VAD_MIN_ENERGY_DB, _MAX_THRESHOLD_DB)
+    starts, ends = _runs(energy_db > threshold)
+    if starts.size == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # Bridge short pauses
+    min_silence = int(np.ceil(VAD_MIN_SILENCE_MS / VAD_FRAME_MS))
+    breaks = (starts[1:] - ends[:-1]) >= min_silence
+    starts = starts[np.concatenate(([True], breaks))]
+    ends = ends[np.concatenate((breaks, [True]))]
+
+    # Drop blips
+    min_speech = int(np.ceil(VAD_MIN_SPEECH_MS / VAD_FRAME_MS))
+    keep = (ends - starts) >= min_speech
+    starts, ends = starts[keep], ends[keep]
+    if starts.size == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # Pad, then merge regions that now touch
+    pad = int(np.ceil(VAD_PAD_MS / VAD_FRAME_MS))
+    starts = np.maximum(starts - pad, 0)
+    ends = np.minimum(ends + pad, energy_db.size)
+    breaks = starts[1:] > ends[:-1]
+    starts = starts[np.concatenate(([True], breaks))]
+    ends = ends[np.concatenate((breaks, [True]))]
+
+    regions = np.stack((starts, ends), axis=1) * frame_len
+    regions[:, 1] = np.minimum(regions[:, 1], len(waveform))
+    return regions
+
+
+def speech_windows(waveform: np.ndarray, sample_rate: int = 16000, max_duration: int = 30):
+    """
+    Groups speech regions into decoding windows of at most `max_duration` seconds.
+
+    Consecutive regions share a window while they fit in it, so silence longer
+    than a window is never decoded. A single region longer than a window is cut
+    at the quietest frame near the window's end rather than at a fixed offset.
+
+    Returns:
+        List[Tuple[int, int]]: [start, end) sample offsets, in playback order.
+    """
+    frame_len = int(sample_rate * VAD_FRAME_MS / 1000)
+    energy_db = frame_energy_db(waveform, frame_len)
+    regions = detect_speech_regions(waveform, sample_rate, energy_db=energy_db)
+
+    max_samples = max_duration * sample_rate
+    search = min(SPLIT_SEARCH_SECONDS * sample_rate, max_samples // 2)
+    windows = []
+    window_start = window_end = None
+
+    for start, end in regions.tolist():
+        if window_start is not None and end - window_start <= max_samples:
+            window_end = end
+            continue
+
+        if window_start is not None:
+            windows.append((window_start, window_end))
+
+        # Cut overlong regions at pauses
+        while end - start > max_samples:
+            lo = (start + max_samples - search) // frame_len
+            hi = (start + max_samples) // frame_len
+            cut = (lo + int(np.argmin(energy_db[lo:hi]))) * frame_len
+            windows.append((start, cut))
+            start = cut
+
+        window_start, window_end = start, end
+
+    if window_start is not None:
+        windows.append((window_start, window_end))
+
+    return windows
+
+
+def iter_speech_windows(blocks, sample_rate: int = 16000, max_duration: int = 30):
+    """
+    Streaming version of `speech_windows` over a sequence of waveform blocks.
+
+    Blocks are buffered until two windows' worth of audio is available. Windows
+    that end at least one window-length before the buffer's end are complete and
+    are yielded; everything before the first pending window is then dropped, so
+    the buffer stays around two windows long whatever the recording length.
+
+    Yields:
+        np.ndarray: Speech windows of at most `max_duration` seconds, in order.
+    """
+    max_samples = max_duration * sample_rate
+    buffer = np.empty(0, dtype=np.float32)
+
+    for block in blocks:
+        buffer = np.concatenate((buffer, block))
+        if len(buffer) < 2 * max_samples:
+            continue
+
+        cutoff = len(buffer) - max_samples
+        consumed = 0
+        pending_start = None
+        for start, end in speech_windows(buffer, sample_rate, max_duration):
+            if end > cutoff:
+                # May still grow; keep it (and anything after) for the next pass
+                pending_start = start
+                break
+            yield buffer[start:end]
+            consumed = end
+
+        # Nothing before `cutoff` is pending, so it is either decoded or silence
+        keep_from = cutoff if pending_start is None else min(pending_start, cutoff)
+        buffer = buffer[max(consumed, keep_from):]
+
+    if len(buffer):
+        for start, end in speech_windows(buffer, sample_rate, max_duration):
+            yield buffer[start:end]
@@ -38,6 +38,9 @@ class Meeting(_database.Base):
     insights = _orm.relationship("MeetingInsights", back_populates="meeting", uselist=False)
     participants = _orm.relationship("Participant", back_populates="meeting")
     chat_messages = _orm.relationship("ChatMessage", back_populates="meeting", cascade="all, delete-orphan")
+    upload_jobs = _orm.relationship("UploadJob", back_populates="meeting", cascade="all, delete-orphan")
+    upload_sessions = _orm.relationship("UploadSession", back_populates="meeting", cascade="all, delete-orphan")
+    chat_sessions = _orm.relationship("ChatSession", back_populates="meeting", cascade="all, delete-orphan")
  
 
 # 2. MeetingLibrary Table
@@ -88,4 +91,69 @@ class ChatMessage(_database.Base):
 
     # Relationships (optional)
     meeting = _orm.relationship("Meeting", back_populates="chat_messages")
-    
\ No newline at end of file
+
+
+class UploadJob(_database.Base):
+    __tablename__ = "upload_jobs"
+
+    id = _sql.Column(_sql.Integer, primary_key=True, index=True)
+    meeting_id = _sql.Column(_sql.Integer, _sql.ForeignKey("meetings.id"), nullable=False)
+    file_path = _sql.Column(_sql.String, nullable=False)
+    file_ext = _sql.Column(_sql.String(10), nullable=False)
+    content_hash = _sql.Column(_sql.String(64), nullable=True, index=True)  # sha256 of the uploaded bytes
+    status = _sql.Column(_sql.String(20), default="queued")  # queued, running, completed, failed
+    stage = _sql.Column(_sql.String(30), default="saved")    # last completed stage
+    attempts = _sql.Column(_sql.Integer, default=0)
+    error = _sql.Column(_sql.Text, nullable=True)
+    owner = _sql.Column(_sql.String(255), nullable=True)  # "<host>:<pid>" of the process running the job
+    heartbeat_at = _sql.Column(_sql.DateTime, nullable=True)  # refreshed while the job runs
+    created_at = _sql.Column(_sql.DateTime, default=_dt.datetime.utcnow)
+    updated_at = _sql.Column(_sql.DateTime, default=_dt.datetime.utcnow, onupdate=_dt.datetime.utcnow)
+
+    meeting = _orm.relationship("Meeting", back_populates="upload_jobs")
+
+
+class UploadSession(_database.Base):
+    __tablename__ = "upload_sessions"
+
+    id = _sql.Column(_sql.String(32), primary_key=True)  # uuid4 hex
+    meeting_id = _sql.Column(_sql.Integer, _sql.ForeignKey("meetings.id"), nullable=False)
+    user_id = _sql.Column(_sql.Integer, _sql.ForeignKey("users.id"), nullable=False)
+    filename = _sql.Column(_sql.String, nullable=False)
+    file_ext = _sql.Column(_sql.String(10), nullable=False)
+    part_path = _sql.Column(_sql.String, nullable=False)
+    total_size = _sql.Column(_sql.BigInteger, nullable=True)
+    received_bytes = _sql.Column(_sql.BigInteger, default=0)
+    status = _sql.Column(_sql.String(20), default="open")  # open, finalized
+    content_hash = _sql.Column(_sql.String(64), nullable=True)
+    job_id = _sql.Column(_sql.Integer, _sql.ForeignKey("upload_jobs.id", ondelete="SET NULL"), nullable=True)
+    created_at = _sql.Column(_sql.DateTime, default=_dt.datetime.utcnow)
+    updated_at = _sql.Column(_sql.DateTime, default=_dt.datetime.utcnow, onupdate=_dt.datetime.utcnow)
+
+    meeting = _orm.relationship("Meeting", back_populates="upload_sessions")
+    # Lets the unit of work delete sessions before the jobs they point to
+    job = _orm.relationship("UploadJob")
+
+
+class ChatSession(_database.Base):
+    """
+    Conversation state of a multi-turn Q&A session about one meeting.
+
+    `llm_context` is the token context Ollama returned for the last turn, sent
+    back with the next one so earlier turns are not re-sent as prompt text.
+    When it nears the CHAT_NUM_CTX window, the turns since the last reset
+    (`recent_turns`) are folded into `summary` and the context starts over.
+    """
+    __tablename__ = "chat_sessions"
+
+    id = _sql.Column(_sql.String(32), primary_key=True)  # uuid4 hex
+    meeting_id = _sql.Column(_sql.Integer, _sql.ForeignKey("meetings.id"), nullable=False)
+    user_id = _sql.Column(_sql.Integer, _sql.ForeignKey("users.id"), nullable=False)
+    llm_context = _sql.Column(JSON, nullable=True)
+    summary = _sql.Column(_sql.Text, nullable=True)
+    recent_turns = _sql.Column(JSON, nullable=True)  # [{"question": ..., "answer": ...}]
+    turns = _sql.Column(_sql.Integer, default=0)
+    created_at = _sql.Column(_sql.DateTime, default=_dt.datetime.utcnow)
+    updated_at = _sql.Column(_sql.DateTime, default=_dt.datetime.utcnow, onupdate=_dt.datetime.utcnow)
+
+    meeting = _orm.relationship("Meeting", back_populates="chat_sessions")
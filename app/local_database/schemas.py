@@ -82,6 +82,42 @@ class MeetingLibraryResponse(BaseModel):
     class Config:
         orm_mode = True
 
+# -------------------- UploadJob --------------------
+class UploadJobStage(BaseModel):
+    name: str
+    done: bool
+
+class UploadJobResponse(BaseModel):
+    job_id: int
+    meeting_id: int
+    status: str
+    stage: str
+    attempts: int
+    error: Optional[str] = None
+    stages: List[UploadJobStage] = []
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+# -------------------- Resumable uploads --------------------
+class UploadSessionCreate(BaseModel):
+    filename: str
+    total_size: Optional[int] = None
+
+class UploadSessionFinalize(BaseModel):
+    sha256: Optional[str] = None  # client-side checksum to verify against
+
+class UploadSessionResponse(BaseModel):
+    upload_id: str
+    meeting_id: int
+    filename: str
+    status: str
+    offset: int
+    total_size: Optional[int] = None
+    sha256: Optional[str] = None
+    job_id: Optional[int] = None
+
+
 # -------------------- MeetingInsights --------------------
 class MeetingInsightsBase(BaseModel):
     summary: Optional[str]
@@ -153,6 +189,11 @@ class MeetingMinutes(BaseModel):
     meeting_id: str
     language: str
 
+class MeetingChat(BaseModel):
+    meeting_id: str
+    question: str
+    session_id: Optional[str] = None  # omit to start a new session
+
 # -------------------- Summarize Meeting --------------------
 
 # class MeetingSummary(BaseModel):
@@ -1,14 +1,36 @@
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware  # ✅ Import CORS
-from app.routers import auth, meeting, user_metadata, generative_ai
+from app.routers import auth, meeting, user_metadata, generative_ai, system
 from app.local_database.database import Base, engine
 from app.helpers.modelloader import ModelRegistry
+from app.helpers.upload_jobs import UploadJobQueue
+from app.helpers.executors import shutdown_executors
+from app.helpers.http_clients import HttpClients
+from app.helpers.transcription_pool import TranscriptionPool
+from app.helpers.constants import MODEL_WARMUP
 
 app = FastAPI()
 
 @app.on_event("startup")
 async def startup_event():
-    ModelRegistry.load_models()
+    HttpClients.start()
+    TranscriptionPool.start()
+    UploadJobQueue.start()
+
+    # Models load lazily on first use; warming up in the background keeps startup instant
+    if MODEL_WARMUP:
+        models = ["summarizer", "sentiment_analyzer"]
+        if not TranscriptionPool.is_running():
+            models.append("whisper")
+        ModelRegistry.warmup(models)
+    ModelRegistry.start_reaper()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    UploadJobQueue.stop()
+    TranscriptionPool.stop()
+    shutdown_executors()
+    await HttpClients.stop()
 
 # ✅ CORS Configuration
 app.add_middleware(
@@ -25,6 +47,7 @@ app.include_router(auth.router)
 app.include_router(meeting.router)
 app.include_router(user_metadata.router)
 app.include_router(generative_ai.router)
+app.include_router(system.router)
 
 DATAPREP_URL = "http://localhost:6007/v1/dataprep/ingest"
 UPLOADS_DIR = "uploaded_files"
@@ -1,14 +1,23 @@
 from fastapi import APIRouter ,  HTTPException 
+from fastapi.responses import StreamingResponse
 import fastapi as _fastapi
 import app.local_database.schemas as _schemas
 import app.local_database.models as _models
 import app.helpers.auth_services as _services
 import app.local_database.database as _database
-from app.helpers.constants import EMBEDDING_URL , RETRIVER_URL
-from app.helpers.utils import get_embedding, retrieve_similar_documents, build_qa_prompt , generate_llm_answer , meeting_minutes_prompt , parse_meeting_minutes , summarize_text , analyze_sentiment
+from app.helpers.constants import EMBEDDING_URL , RETRIVER_URL , MINUTES_SEGMENT_CHARS , CHAT_NUM_CTX , CHAT_CONTEXT_COMPRESS_RATIO
+from app.helpers.utils import get_embedding, retrieve_similar_documents, build_qa_prompt , generate_llm_answer , meeting_minutes_prompt , parse_meeting_minutes , summarize_transcript , analyze_sentiment , stream_llm_answer , map_meeting_minutes , reduce_meeting_minutes , build_chat_prompt , chat_summary_prompt , generate_llm_turn
+from app.helpers.sentiment_store import to_columnar, from_legacy, is_columnar, expand, sentiment_aggregates, matches_transcript
+from app.helpers.executors import run_cpu_bound, run_io_bound, ExecutorSaturatedError
+from app.helpers.http_clients import UpstreamUnavailableError
+from app.helpers.answer_cache import answer_cache, index_version
+from app.helpers.single_flight import single_flight
 from app.logger import Logger
 import sqlalchemy.orm as _orm
+import json
 import os 
+import time
+import uuid
 
 # Create an instance of the Logger class
 logger_instance = Logger()
@@ -17,6 +26,9 @@ logger = logger_instance.get_logger("generative_ai")
 router = APIRouter(
     tags=["generative_ai"])
 
+# Keep proxies from buffering server-sent events
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 
 def get_db():
     db = _database.SessionLocal()
@@ -26,32 +38,41 @@ def get_db():
         db.close()
 
 
-@router.post("/ai/meeting_qna")
-async def meeting_qna(  
-    meeting: _schemas.MeetingQandA,
-    db: _orm.Session = _fastapi.Depends(get_db),
-    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
-):
-    question = meeting.question
-    meeting_id = meeting.meeting_id
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 
+async def _qa_embedding(question: str, meeting_id, db: _orm.Session, user: _schemas.User):
     # 🔐 Validate ownership of meeting
     meeting_obj = db.query(_models.Meeting).filter_by(id=meeting_id, user_id=user.id).first()
     if not meeting_obj:
         raise HTTPException(status_code=404, detail="Meeting not found or not authorized")
 
-    index_name = str(meeting_id)
-
     # Step 1: Get embedding
     try:
-        embedding = get_embedding(question)
+        return await get_embedding(question)
+    except UpstreamUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Embedding failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate embedding")
 
+
+async def _qa_prompt(question: str, embedding, meeting_id) -> str:
+    context_chunks = await _qa_context(question, embedding, meeting_id)
+
+    # Step 3: Build prompt
+    return build_qa_prompt(question, context_chunks)
+
+
+async def _qa_context(question: str, embedding, meeting_id):
+    index_name = str(meeting_id)
+
     # Step 2: Retrieve similar chunks
     try:
-        context_chunks = retrieve_similar_documents(text=question, embedding=embedding, index_name=index_name)
+        context_chunks = await retrieve_similar_documents(text=question, embedding=embedding, index_name=index_name)
+    except UpstreamUnavailableError:
+        raise
     except Exception as e:
         logger.error(f"Document retrieval failed: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to retrieve context")
@@ -59,17 +80,19 @@ async def meeting_qna(
     if not context_chunks:
         raise HTTPException(status_code=404, detail="No relevant context found")
 
-    # Step 3: Build prompt
-    prompt = build_qa_prompt(question, context_chunks)
+    return context_chunks
 
-    # Step 4: Generate LLM answer
+
+def _with_session(func, *args):
+    # Streaming responses outlive the request's session, so they open their own
+    db = _database.SessionLocal()
     try:
-        answer = generate_llm_answer(prompt)
-    except Exception as e:
-        logger.error(f"LLM generation failed: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to generate answer")
+        return func(db, *args)
+    finally:
+        db.close()
 
-    # Step 5: Save chat messages
+
+def _save_chat_messages(db: _orm.Session, meeting_id, question: str, answer: str):
     user_message = _models.ChatMessage(
         meeting_id=meeting_id,
         message=question,
@@ -85,35 +108,186 @@ async def meeting_qna(
     db.add_all([user_message, bot_message])
     db.commit()
 
-    return {"question": question, "answer": answer}
 
+@router.post("/ai/meeting_qna")
+async def meeting_qna(  
+    meeting: _schemas.MeetingQandA,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    question = meeting.question
+    meeting_id = meeting.meeting_id
 
+    embedding = await _qa_embedding(question, meeting_id, db, user)
 
+    # A close enough question about the same indexed transcript reuses its answer
+    version = index_version(db, meeting_id)
+    cached = answer_cache.get(meeting_id, version, embedding)
+    if cached:
+        _save_chat_messages(db, meeting_id, question, cached["answer"])
+        return {"question": question, "answer": cached["answer"], "cached": True}
 
-@router.post("/ai/meeting_minutes/")
-async def generate_meeting_minutes(
-    meeting_input: _schemas.MeetingMinutes,
+    started = time.perf_counter()
+    prompt = await _qa_prompt(question, embedding, meeting_id)
+
+    # Step 4: Generate LLM answer
+    try:
+        answer = await generate_llm_answer(prompt)
+    except UpstreamUnavailableError:
+        raise
+    except Exception as e:
+        logger.error(f"LLM generation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to generate answer")
+
+    answer_cache.put(meeting_id, version, embedding, question, answer, time.perf_counter() - started)
+
+    # Step 5: Save chat messages
+    _save_chat_messages(db, meeting_id, question, answer)
+
+    return {"question": question, "answer": answer, "cached": False}
+
+
+@router.post("/ai/meeting_qna/stream")
+async def meeting_qna_stream(
+    meeting: _schemas.MeetingQandA,
     db: _orm.Session = _fastapi.Depends(get_db),
     user: _schemas.User = _fastapi.Depends(_services.get_current_user)
 ):
-    meeting_id = meeting_input.meeting_id
-    language = meeting_input.language
+    """
+    Same as /ai/meeting_qna, but forwards the answer as server-sent events:
+    `token` events while Ollama generates, then one `done` event with the full
+    answer once it has been saved to the chat history.
+    """
+    question = meeting.question
+    meeting_id = meeting.meeting_id
 
-    # 🔐 Validate meeting ownership
-    meeting = db.query(_models.Meeting).filter_by(id=meeting_id, user_id=user.id).first()
-    if not meeting:
-        raise _fastapi.HTTPException(status_code=404, detail="Meeting not found or not authorized")
+    embedding = await _qa_embedding(question, meeting_id, db, user)
 
-    # 🧠 Check for existing AI insights
-    insight = db.query(_models.MeetingInsights).filter_by(meeting_id=meeting_id).first()
+    version = index_version(db, meeting_id)
+    cached = answer_cache.get(meeting_id, version, embedding)
+    if cached:
+        _save_chat_messages(db, meeting_id, question, cached["answer"])
+        payload = {"question": question, "answer": cached["answer"], "cached": True}
+        return StreamingResponse(iter([_sse("done", payload)]), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    started = time.perf_counter()
+    prompt = await _qa_prompt(question, embedding, meeting_id)
+
+    async def events():
+        parts = []
+        try:
+            async for token in stream_llm_answer(prompt):
+                parts.append(token)
+                yield _sse("token", {"token": token})
+        except Exception as e:
+            logger.error(f"LLM generation failed: {str(e)}")
+            yield _sse("error", {"detail": "Failed to generate answer"})
+            return
+
+        answer = "".join(parts)
+        answer_cache.put(meeting_id, version, embedding, question, answer, time.perf_counter() - started)
+        await run_io_bound(_with_session, _save_chat_messages, meeting_id, question, answer)
+        yield _sse("done", {"question": question, "answer": answer, "cached": False})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.post("/ai/meeting_chat")
+async def meeting_chat(
+    chat: _schemas.MeetingChat,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    """
+    Multi-turn Q&A about a meeting. Omit `session_id` to start a session and
+    send the returned one with follow-up questions.
+
+    Each turn sends only the newly retrieved passages and the question; earlier
+    turns are carried by Ollama's context tokens from the previous turn. Once
+    that context fills CHAT_CONTEXT_COMPRESS_RATIO of the CHAT_NUM_CTX window
+    it is replaced by a short summary of the conversation, so a follow-up
+    costs about the same as the first question no matter how long the
+    session runs.
+    """
+    question = chat.question
+    meeting_id = chat.meeting_id
+
+    embedding = await _qa_embedding(question, meeting_id, db, user)
+
+    if chat.session_id:
+        session = db.query(_models.ChatSession).filter_by(id=chat.session_id, meeting_id=meeting_id, user_id=user.id).first()
+        if not session:
+            raise HTTPException(status_code=404, detail="Chat session not found")
+    else:
+        session = _models.ChatSession(
+            id=uuid.uuid4().hex,
+            meeting_id=meeting_id,
+            user_id=user.id,
+            recent_turns=[],
+            turns=0
+        )
+        db.add(session)
+
+    context_chunks = await _qa_context(question, embedding, meeting_id)
+    prompt = build_chat_prompt(
+        question,
+        context_chunks,
+        summary=None if session.llm_context else session.summary,
+        first_turn=not session.llm_context
+    )
+
+    try:
+        answer, llm_context = await generate_llm_turn(prompt, session.llm_context)
+    except UpstreamUnavailableError:
+        raise
+    except Exception as e:
+        logger.error(f"LLM generation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to generate answer")
+
+    recent_turns = (session.recent_turns or []) + [{"question": question, "answer": answer}]
+    if len(llm_context) > CHAT_NUM_CTX * CHAT_CONTEXT_COMPRESS_RATIO:
+        # Fold the turns carried by the context into the rolling summary and start over
+        try:
+            summary = await generate_llm_answer(chat_summary_prompt(session.summary, recent_turns))
+            session.summary = summary.strip()
+            llm_context, recent_turns = None, []
+        except UpstreamUnavailableError:
+            raise
+        except Exception as e:
+            logger.warning(f"Chat session {session.id} summary failed, keeping full context: {str(e)}")
+
+    # Assign new objects so the JSON columns are flagged as changed
+    session.llm_context = llm_context
+    session.recent_turns = recent_turns
+    session.turns = (session.turns or 0) + 1
+
+    _save_chat_messages(db, meeting_id, question, answer)
+
+    return {
+        "session_id": session.id,
+        "question": question,
+        "answer": answer,
+        "turn": session.turns,
+        "context_tokens": len(llm_context or [])
+    }
 
-    if insight and insight.is_minutes_stored and not insight.reset_requested:
-        return {
-            "meeting_id": meeting_id,
-            "minutes_of_meeting": insight.minutes_of_meeting,
-            "cached": True
-        }
 
+@router.delete("/ai/meeting_chat/{session_id}")
+async def end_meeting_chat(
+    session_id: str,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    session = db.query(_models.ChatSession).filter_by(id=session_id, user_id=user.id).first()
+    if not session:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+
+    db.delete(session)
+    db.commit()
+    return {"session_id": session_id, "detail": "Chat session ended"}
+
+
+async def _minutes_prompt(meeting_id, db: _orm.Session) -> str:
     # 🗂️ Fetch related MeetingLibrary record
     library_entry = db.query(_models.MeetingLibrary).filter_by(meeting_id=meeting_id).first()
     if not library_entry or not library_entry.transcript_path:
@@ -130,18 +304,26 @@ async def generate_meeting_minutes(
         logger.error(f"Failed to read transcript: {str(e)}")
         raise _fastapi.HTTPException(status_code=500, detail="Failed to read transcript")
 
-    # 🧠 Build prompt and call LLM
-    context_chunks = [{"text": transcript_text}]
-    prompt = meeting_minutes_prompt(context_chunks)
+    if len(transcript_text) <= MINUTES_SEGMENT_CHARS:
+        # 🧠 Build prompt
+        context_chunks = [{"text": transcript_text}]
+        return meeting_minutes_prompt(context_chunks)
 
+    # Too long for one prompt: partial minutes per segment, merged in rounds
+    # until one merge prompt fits
     try:
-        meeting_minutes = generate_llm_answer(prompt)
-        structured_minutes = parse_meeting_minutes(meeting_minutes)
+        partials = await map_meeting_minutes(transcript_text)
+        return await reduce_meeting_minutes(partials)
+    except UpstreamUnavailableError:
+        raise
     except Exception as e:
-        logger.error(f"LLM generation failed: {str(e)}")
+        logger.error(f"Partial minutes generation failed: {str(e)}")
         raise _fastapi.HTTPException(status_code=500, detail="Failed to generate meeting minutes")
 
+
+def _save_minutes(db: _orm.Session, meeting_id, structured_minutes):
     # 📝 Save or update MeetingInsights
+    insight = db.query(_models.MeetingInsights).filter_by(meeting_id=meeting_id).first()
     if insight:
         insight.minutes_of_meeting = structured_minutes
         insight.is_minutes_stored = True
@@ -157,12 +339,136 @@ async def generate_meeting_minutes(
 
     db.commit()
 
+
+def _load_insight(db: _orm.Session, meeting_id, kind: str):
+    """Stored summary, minutes or sentiments of a meeting, or None if not (validly) stored."""
+    insight = db.query(_models.MeetingInsights).filter_by(meeting_id=meeting_id).first()
+    if not insight or insight.reset_requested:
+        return None
+    if kind == "summary":
+        return insight.summary if insight.is_summary_stored else None
+    if kind == "minutes":
+        return insight.minutes_of_meeting if insight.is_minutes_stored else None
+    return insight.sentiments if insight.is_sentiment_stored else None
+
+
+def _stored_minutes(meeting_id, db: _orm.Session, user: _schemas.User):
+    # 🔐 Validate meeting ownership
+    meeting = db.query(_models.Meeting).filter_by(id=meeting_id, user_id=user.id).first()
+    if not meeting:
+        raise _fastapi.HTTPException(status_code=404, detail="Meeting not found or not authorized")
+
+    # 🧠 Check for existing AI insights
+    insight = db.query(_models.MeetingInsights).filter_by(meeting_id=meeting_id).first()
+    if insight and insight.is_minutes_stored and not insight.reset_requested:
+        return insight.minutes_of_meeting
+    return None
+
+
+@router.post("/ai/meeting_minutes/")
+async def generate_meeting_minutes(
+    meeting_input: _schemas.MeetingMinutes,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    meeting_id = meeting_input.meeting_id
+    language = meeting_input.language
+
+    stored = _stored_minutes(meeting_id, db, user)
+    if stored is not None:
+        return {
+            "meeting_id": meeting_id,
+            "minutes_of_meeting": stored,
+            "cached": True
+        }
+
+    async def compute():
+        # Runs detached from this request (see SingleFlight), so it uses its own session
+        task_db = _database.SessionLocal()
+        try:
+            prompt = await _minutes_prompt(meeting_id, task_db)
+
+            try:
+                meeting_minutes = await generate_llm_answer(prompt)
+                structured_minutes = parse_meeting_minutes(meeting_minutes)
+            except UpstreamUnavailableError:
+                raise
+            except Exception as e:
+                logger.error(f"LLM generation failed: {str(e)}")
+                raise _fastapi.HTTPException(status_code=500, detail="Failed to generate meeting minutes")
+
+            _save_minutes(task_db, meeting_id, structured_minutes)
+            return structured_minutes
+        finally:
+            task_db.close()
+
+    structured_minutes = await single_flight.run(
+        f"minutes:{meeting_id}", compute, lambda: _with_session(_load_insight, meeting_id, "minutes")
+    )
+
     return {
         "meeting_id": meeting_id,
         "minutes_of_meeting": structured_minutes,
         "cached": False
     }
 
+
+@router.post("/ai/meeting_minutes/stream")
+async def generate_meeting_minutes_stream(
+    meeting_input: _schemas.MeetingMinutes,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    """
+    Streams the raw minutes text as `token` server-sent events; the final `done`
+    event carries the parsed minutes after they are stored in MeetingInsights.
+    Stored minutes are sent as a single `done` event.
+    """
+    meeting_id = meeting_input.meeting_id
+
+    stored = _stored_minutes(meeting_id, db, user)
+    if stored is not None:
+        payload = {"meeting_id": meeting_id, "minutes_of_meeting": stored, "cached": True}
+        return StreamingResponse(iter([_sse("done", payload)]), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    prompt = await _minutes_prompt(meeting_id, db)
+
+    async def events():
+        parts = []
+        try:
+            async for token in stream_llm_answer(prompt):
+                parts.append(token)
+                yield _sse("token", {"token": token})
+            structured_minutes = parse_meeting_minutes("".join(parts))
+        except Exception as e:
+            logger.error(f"LLM generation failed: {str(e)}")
+            yield _sse("error", {"detail": "Failed to generate meeting minutes"})
+            return
+
+        await run_io_bound(_with_session, _save_minutes, meeting_id, structured_minutes)
+        yield _sse("done", {"meeting_id": meeting_id, "minutes_of_meeting": structured_minutes, "cached": False})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+def _save_summary(db: _orm.Session, meeting_id, summary: str):
+    # 💾 Save or update summary
+    insight = db.query(_models.MeetingInsights).filter_by(meeting_id=meeting_id).first()
+    if insight:
+        insight.summary = summary
+        insight.is_summary_stored = True
+        insight.reset_requested = False
+    else:
+        insight = _models.MeetingInsights(
+            meeting_id=meeting_id,
+            summary=summary,
+            is_summary_stored=True,
+            reset_requested=False
+        )
+        db.add(insight)
+
+    db.commit()
+
+
 @router.get("/ai/summary/{meeting_id}")
 async def generate_meeting_summary(
     meeting_id: int,
@@ -200,28 +506,22 @@ async def generate_meeting_summary(
         logger.error(f"Failed to read transcript: {str(e)}")
         raise _fastapi.HTTPException(status_code=500, detail="Failed to read transcript")
 
-    # ✨ Summarize
-    try:
-        summary = summarize_text(transcript_text)
-    except Exception as e:
-        logger.error(f"Summarization failed: {str(e)}")
-        raise _fastapi.HTTPException(status_code=500, detail="Failed to summarize transcript")
-
-    # 💾 Save or update summary
-    if insight:
-        insight.summary = summary
-        insight.is_summary_stored = True
-        insight.reset_requested = False
-    else:
-        insight = _models.MeetingInsights(
-            meeting_id=meeting_id,
-            summary=summary,
-            is_summary_stored=True,
-            reset_requested=False
-        )
-        db.add(insight)
-
-    db.commit()
+    async def compute():
+        # ✨ Summarize
+        try:
+            summary = await summarize_transcript(transcript_text)
+        except ExecutorSaturatedError:
+            raise
+        except Exception as e:
+            logger.error(f"Summarization failed: {str(e)}")
+            raise _fastapi.HTTPException(status_code=500, detail="Failed to summarize transcript")
+
+        _with_session(_save_summary, meeting_id, summary)
+        return summary
+
+    summary = await single_flight.run(
+        f"summary:{meeting_id}", compute, lambda: _with_session(_load_insight, meeting_id, "summary")
+    )
 
     return {
         "meeting_id": meeting_id,
@@ -311,51 +611,58 @@ async def reset_ai_generated_data(
 
 
 
-@router.get("/meetings/get_sentiment/{meeting_id}")
-async def generate_meeting_sentiment(
-    meeting_id: int,
-    db: _orm.Session = _fastapi.Depends(get_db),
-    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
-):
+async def _meeting_sentiment(meeting_id: int, db: _orm.Session, user: _schemas.User):
+    """
+    Returns the meeting's stored sentiment record (computing it if needed),
+    whether it was cached, and the transcript lines it refers to.
+    """
     # 🔐 Verify user and meeting
     meeting = db.query(_models.Meeting).filter_by(id=meeting_id, user_id=user.id).first()
     if not meeting:
         raise _fastapi.HTTPException(status_code=404, detail="Meeting not found or not authorized")
 
+    transcript_path = _transcript_path(meeting_id, db)
+
+    # 📖 Read transcript; a stored record only applies to the transcript it was computed from
+    try:
+        with open(transcript_path, "r", encoding="utf-8") as f:
+            transcript_lines = f.readlines()
+    except Exception as e:
+        raise _fastapi.HTTPException(status_code=500, detail=f"Error reading transcript: {str(e)}")
+
     # 🔍 Get or create insights record
     insight = db.query(_models.MeetingInsights).filter_by(meeting_id=meeting_id).first()
 
-    if insight and insight.is_sentiment_stored and not insight.reset_requested:
-        return {
-            "meeting_id": meeting_id,
-            "sentiments": insight.sentiments,
-            "cached": True
-        }
+    if insight and insight.is_sentiment_stored and not insight.reset_requested and matches_transcript(insight.sentiments, transcript_lines):
+        return insight.sentiments, True, transcript_lines
 
-    # 📄 Get transcript
-    library_entry = db.query(_models.MeetingLibrary).filter_by(meeting_id=meeting_id).first()
-    if not library_entry or not library_entry.transcript_path:
-        raise _fastapi.HTTPException(status_code=404, detail="Transcript not found")
+    # Remember each line's position in the file
+    numbered_lines = [(number, line.strip()) for number, line in enumerate(transcript_lines) if line.strip()]
 
-    transcript_path = library_entry.transcript_path
-    if not os.path.exists(transcript_path):
-        raise _fastapi.HTTPException(status_code=404, detail="Transcript file missing on disk")
+    async def compute():
+        # ✨ Perform sentiment analysis
+        try:
+            results = await run_cpu_bound(analyze_sentiment, [line for _, line in numbered_lines])
+        except ExecutorSaturatedError:
+            raise
+        except Exception as e:
+            raise _fastapi.HTTPException(status_code=500, detail=f"Sentiment analysis failed: {str(e)}")
 
-    # 📖 Read transcript
-    try:
-        with open(transcript_path, "r", encoding="utf-8") as f:
-            transcript_lines = [line.strip() for line in f if line.strip()]
-    except Exception as e:
-        raise _fastapi.HTTPException(status_code=500, detail=f"Error reading transcript: {str(e)}")
+        sentiments = to_columnar(results, [number for number, _ in numbered_lines], transcript_lines)
+        _with_session(_save_sentiments, meeting_id, sentiments)
+        return sentiments
 
-    # ✨ Perform sentiment analysis
-    try:
-        
-        sentiments = analyze_sentiment(transcript_lines)
-    except Exception as e:
-        raise _fastapi.HTTPException(status_code=500, detail=f"Sentiment analysis failed: {str(e)}")
+    def load_existing():
+        stored = _with_session(_load_insight, meeting_id, "sentiment")
+        return stored if stored is not None and matches_transcript(stored, transcript_lines) else None
 
+    sentiments = await single_flight.run(f"sentiment:{meeting_id}", compute, load_existing)
+    return sentiments, False, transcript_lines
+
+
+def _save_sentiments(db: _orm.Session, meeting_id, sentiments: dict):
     # 💾 Save or update insights
+    insight = db.query(_models.MeetingInsights).filter_by(meeting_id=meeting_id).first()
     if insight:
         insight.sentiments = sentiments
         insight.is_sentiment_stored = True
@@ -370,8 +677,54 @@ async def generate_meeting_sentiment(
 
     db.commit()
 
+
+def _transcript_path(meeting_id: int, db: _orm.Session) -> str:
+    # 📄 Get transcript
+    library_entry = db.query(_models.MeetingLibrary).filter_by(meeting_id=meeting_id).first()
+    if not library_entry or not library_entry.transcript_path:
+        raise _fastapi.HTTPException(status_code=404, detail="Transcript not found")
+
+    transcript_path = library_entry.transcript_path
+    if not os.path.exists(transcript_path):
+        raise _fastapi.HTTPException(status_code=404, detail="Transcript file missing on disk")
+    return transcript_path
+
+
+@router.get("/meetings/get_sentiment/{meeting_id}")
+async def generate_meeting_sentiment(
+    meeting_id: int,
+    format: str = _fastapi.Query("lines", pattern="^(lines|columnar)$"),
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    sentiments, cached, transcript_lines = await _meeting_sentiment(meeting_id, db, user)
+
+    if format == "lines" and is_columnar(sentiments):
+        # Line text is read back from the transcript instead of being stored per line
+        sentiments = expand(sentiments, transcript_lines)
+    elif format == "columnar" and not is_columnar(sentiments):
+        sentiments = from_legacy(sentiments)
+
     return {
         "meeting_id": meeting_id,
         "sentiments": sentiments,
-        "cached": False
+        "cached": cached
+    }
+
+
+@router.get("/meetings/sentiment_aggregates/{meeting_id}")
+async def get_meeting_sentiment_aggregates(
+    meeting_id: int,
+    windows: int = _fastapi.Query(20, ge=1, le=500),
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    sentiments, cached, _ = await _meeting_sentiment(meeting_id, db, user)
+    if not is_columnar(sentiments):
+        sentiments = from_legacy(sentiments)
+
+    return {
+        "meeting_id": meeting_id,
+        **sentiment_aggregates(sentiments, windows),
+        "cached": cached
     }
@@ -10,6 +10,9 @@ from app.logger import Logger
 from typing import List, Optional
 import os
 from app.helpers.utils import  MeetingCleanup
+from app.helpers.executors import run_io_bound
+from app.helpers.answer_cache import answer_cache
+import app.helpers.resumable_uploads as _resumable
 
 from fastapi import status
 
@@ -142,11 +145,10 @@ async def delete_meeting(
 
     cleanup = MeetingCleanup()
 
-    # Delete Redis vectors
-    redis_deleted_count = cleanup.delete_rag_redis_vectors(str(meeting_id))
-
-    # Delete local files
-    deleted_file_paths = cleanup.delete_all_meeting_files(library_entry)
+    # Remember what to clean up; it is removed only once the records are gone,
+    # so a failed delete leaves the meeting intact
+    file_paths = cleanup.meeting_file_paths(library_entry)
+    open_uploads = [(upload.id, upload.part_path) for upload in meeting.upload_sessions if upload.status == "open"]
 
     # Delete DB records
     if library_entry:
@@ -154,6 +156,14 @@ async def delete_meeting(
     db.delete(meeting)
     db.commit()
 
+    # Delete Redis vectors
+    redis_deleted_count = await run_io_bound(cleanup.delete_rag_redis_vectors, str(meeting_id))
+
+    # Delete local files, including partial files of unfinished resumable uploads
+    deleted_file_paths = await run_io_bound(cleanup.delete_all_meeting_files, file_paths)
+    deleted_file_paths += await run_io_bound(_resumable.discard_parts, open_uploads)
+    answer_cache.invalidate(meeting_id)
+
     return {
         "detail": f"Meeting {meeting_id} deleted successfully",
         "redis_vectors_deleted": redis_deleted_count,
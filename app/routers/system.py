@@ -0,0 +1,50 @@
+from fastapi import APIRouter
+from app.helpers.transcript_cache import transcript_cache
+from app.helpers.summary_cache import summary_cache
+from app.helpers.sentiment_cache import sentiment_cache
+from app.helpers.answer_cache import answer_cache
+from app.helpers.modelloader import ModelRegistry
+from app.helpers.transcription_pool import TranscriptionPool
+from app.helpers.http_clients import HttpClients
+from app.helpers.single_flight import single_flight
+from app.logger import Logger
+
+# Create an instance of the Logger class
+logger_instance = Logger()
+# Get a logger for your module
+logger = logger_instance.get_logger("system")
+router = APIRouter(
+    tags=["system"])
+
+
+@router.get("/system/cache_stats")
+async def get_cache_stats():
+    return {
+        "transcript_cache": transcript_cache.stats(),
+        "summary_cache": summary_cache.stats(),
+        "sentiment_cache": sentiment_cache.stats(),
+        "answer_cache": answer_cache.stats(),
+    }
+
+
+@router.get("/system/readiness")
+async def get_readiness():
+    # The API serves auth and meeting CRUD right away; models report their own state
+    models = ModelRegistry.status()
+
+    # With the transcription pool running, Whisper lives in the worker processes
+    pool_running = TranscriptionPool.is_running()
+    required = [name for name in models if not (name == "whisper" and pool_running)]
+
+    return {
+        "status": "ok",
+        "models_ready": all(models[name]["loaded"] for name in required),
+        "models": models,
+        "model_memory": ModelRegistry.memory(),
+        "transcription_pool": {
+            "running": pool_running,
+            "workers": TranscriptionPool.num_workers(),
+        },
+        "upstreams": HttpClients.stats(),
+        "insight_generation": single_flight.stats(),
+    }
@@ -2,19 +2,23 @@
 from fastapi import APIRouter ,  HTTPException , BackgroundTasks
 from fastapi.responses import StreamingResponse
 import fastapi as _fastapi
-from fastapi import UploadFile, File, Form
+from fastapi import UploadFile, File, Form, Request
+from starlette.requests import ClientDisconnect
 import app.local_database.schemas as _schemas
 import app.local_database.models as _models
 import sqlalchemy.orm as _orm
 import app.helpers.auth_services as _services
 import app.local_database.database as _database
-from app.helpers.constants import DATAPREP_URL, UPLOAD_DIR 
-from app.helpers.utils import transcribe_audio
+from app.helpers.constants import UPLOAD_DIR 
+from app.helpers.upload_jobs import UploadJobQueue, add_upload_job, create_upload_job, job_to_dict
+import app.helpers.resumable_uploads as _resumable
+from app.helpers.executors import run_io_bound
 from app.logger import Logger
-import requests
+from typing import List, Optional
+from sqlalchemy.exc import OperationalError
 import os 
-import shutil
-import moviepy as mp
+import hashlib
+import uuid
 
 # Create an instance of the Logger class
 logger_instance = Logger()
@@ -23,6 +27,9 @@ logger = logger_instance.get_logger("user_metadata")
 router = APIRouter(
     tags=["user_metadata"])
 
+UPLOAD_COPY_BUFFER = 1024 * 1024  # bytes per read while saving uploads
+SUPPORTED_UPLOAD_EXTENSIONS = ["txt", "mp3", "wav", "mp4"]
+
 
 def get_db():
     db = _database.SessionLocal()
@@ -33,7 +40,7 @@ def get_db():
 
 
 
-@router.post("/upload_meeting_file/{meeting_id}", response_model=_schemas.MeetingLibraryResponse)
+@router.post("/upload_meeting_file/{meeting_id}", response_model=_schemas.UploadJobResponse, status_code=202)
 async def upload_single_meeting_file(
     meeting_id: int,
     file: UploadFile = File(...),
@@ -41,7 +48,7 @@ async def upload_single_meeting_file(
     user: _schemas.User = _fastapi.Depends(_services.get_current_user)
 ):
     ext = file.filename.split('.')[-1].lower()
-    if ext not in ["txt", "mp3", "wav", "mp4"]:
+    if ext not in SUPPORTED_UPLOAD_EXTENSIONS:
         raise HTTPException(status_code=400, detail="Unsupported file format. Must be .txt, .mp3, .wav, or .mp4")
 
     meeting = db.query(_models.Meeting).filter(
@@ -55,56 +62,256 @@ async def upload_single_meeting_file(
     filename = f"{meeting_id}_{file.filename}"
     file_path = os.path.join(UPLOAD_DIR, filename)
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    def save_upload():
+        # Hash while writing so identical media can reuse an earlier transcript
+        digest = hashlib.sha256()
+        with open(file_path, "wb") as buffer:
+            while True:
+                block = file.file.read(UPLOAD_COPY_BUFFER)
+                if not block:
+                    break
+                digest.update(block)
+                buffer.write(block)
+        return digest.hexdigest()
 
-    # Prepare meeting library record
-    library = db.query(_models.MeetingLibrary).filter_by(meeting_id=meeting_id).first()
-    if not library:
-        library = _models.MeetingLibrary(meeting_id=meeting_id)
-        db.add(library)
-
-    transcript_text = None
-    if ext == "txt":
-        library.transcript_path = file_path
-    elif ext in ["mp3", "wav"]:
-        library.audio_path = file_path
-        transcript_text = transcribe_audio(file_path)
-    elif ext == "mp4":
-        library.video_path = file_path
-        audio_temp_path = file_path.replace(".mp4", ".mp3")
-        try:
-            mp.VideoFileClip(file_path).audio.write_audiofile(audio_temp_path)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to extract audio: {str(e)}")
+    content_hash = await run_io_bound(save_upload)
 
-        transcript_text = transcribe_audio(audio_temp_path)
+    # ⏳ Transcription and ingestion run in the background job workers
+    job = create_upload_job(db, meeting_id, file_path, ext, content_hash)
+    return job_to_dict(job)
 
-    # If transcription done, save to .txt
-    if transcript_text:
-        transcript_path = file_path.rsplit('.', 1)[0] + "_transcript.txt"
-        with open(transcript_path, "w", encoding="utf-8") as f:
-            f.write(transcript_text)
-        library.transcript_path = transcript_path
 
+@router.get("/upload_jobs/{job_id}", response_model=_schemas.UploadJobResponse)
+async def get_upload_job_status(
+    job_id: int,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    job = (
+        db.query(_models.UploadJob)
+        .join(_models.Meeting, _models.Meeting.id == _models.UploadJob.meeting_id)
+        .filter(_models.UploadJob.id == job_id, _models.Meeting.user_id == user.id)
+        .first()
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+
+    return job_to_dict(job)
+
+
+@router.get("/upload_jobs/meeting/{meeting_id}", response_model=List[_schemas.UploadJobResponse])
+async def list_meeting_upload_jobs(
+    meeting_id: int,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    meeting = db.query(_models.Meeting).filter_by(id=meeting_id, user_id=user.id).first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    jobs = (
+        db.query(_models.UploadJob)
+        .filter_by(meeting_id=meeting_id)
+        .order_by(_models.UploadJob.created_at.desc())
+        .all()
+    )
+    return [job_to_dict(job) for job in jobs]
+
+
+# -------------------- Resumable uploads --------------------
+# create -> PUT chunks at the current offset (resume after a drop with GET) -> finalize
+
+def upload_session_to_dict(session, sha256: str = None) -> dict:
+    return {
+        "upload_id": session.id,
+        "meeting_id": session.meeting_id,
+        "filename": session.filename,
+        "status": session.status,
+        "offset": session.received_bytes or 0,
+        "total_size": session.total_size,
+        "sha256": sha256 or session.content_hash,
+        "job_id": session.job_id,
+    }
+
+
+def get_upload_session(db, upload_id: str, user_id: int, lock: bool = False):
+    query = db.query(_models.UploadSession).filter_by(id=upload_id, user_id=user_id)
+    if lock:
+        # Serializes writes to one session across workers; NOWAIT so a concurrent
+        # request fails fast instead of blocking the event loop on the row lock
+        query = query.with_for_update(nowait=True)
+    try:
+        session = query.first()
+    except OperationalError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Another request is writing to this upload, retry shortly")
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return session
+
+
+@router.post("/uploads/create/{meeting_id}", response_model=_schemas.UploadSessionResponse, status_code=201)
+async def create_upload_session(
+    meeting_id: int,
+    upload: _schemas.UploadSessionCreate,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    filename = os.path.basename(upload.filename)
+    ext = filename.split('.')[-1].lower()
+    if ext not in SUPPORTED_UPLOAD_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="Unsupported file format. Must be .txt, .mp3, .wav, or .mp4")
+
+    meeting = db.query(_models.Meeting).filter_by(id=meeting_id, user_id=user.id).first()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    upload_id = uuid.uuid4().hex
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    part_path = os.path.join(UPLOAD_DIR, f"{meeting_id}_{upload_id}.part")
+    open(part_path, "wb").close()
+
+    session = _models.UploadSession(
+        id=upload_id,
+        meeting_id=meeting_id,
+        user_id=user.id,
+        filename=filename,
+        file_ext=ext,
+        part_path=part_path,
+        total_size=upload.total_size,
+        received_bytes=0,
+        status="open"
+    )
+    db.add(session)
     db.commit()
-    db.refresh(library)
+    db.refresh(session)
+
+    logger.info(f"Opened upload session {upload_id} for meeting {meeting_id} ({filename})")
+    return upload_session_to_dict(session)
+
+
+@router.get("/uploads/{upload_id}", response_model=_schemas.UploadSessionResponse)
+async def get_upload_session_status(
+    upload_id: str,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    return upload_session_to_dict(get_upload_session(db, upload_id, user.id))
+
+
+@router.put("/uploads/{upload_id}/chunk", response_model=_schemas.UploadSessionResponse)
+async def append_upload_chunk(
+    upload_id: str,
+    offset: int,
+    request: Request,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    session = get_upload_session(db, upload_id, user.id, lock=True)
+    if session.status != "open":
+        raise HTTPException(status_code=409, detail="Upload session is already finalized")
+    if offset != session.received_bytes:
+        raise HTTPException(
+            status_code=409,
+            detail={"msg": "Chunk offset does not match the uploaded size", "offset": session.received_bytes}
+        )
+
+    digest = await run_io_bound(_resumable.checksum_state, upload_id, session.part_path, session.received_bytes)
+    written = 0
+    pending = bytearray()
+
+    async def flush():
+        nonlocal written
+        if session.total_size is not None and offset + written + len(pending) > session.total_size:
+            raise HTTPException(status_code=400, detail="Chunk exceeds the declared total size")
+        await run_io_bound(_resumable.write_at, session.part_path, offset + written, bytes(pending), digest)
+        written += len(pending)
+        pending.clear()
 
-    # Vector embedding call
     try:
-        with open(library.transcript_path, 'rb') as f:
-            files = {'files': (os.path.basename(library.transcript_path), f)}
-            data = {
-                "index_name": str(meeting_id),
-                "chunk_size": "500",
-                "chunk_overlap": "200"
-            }
-            r = requests.post(DATAPREP_URL, files=files, data=data)
-            r.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        raise HTTPException(status_code=500, detail=f"File uploaded but embedding failed: {str(e)}")
-
-    return library
+        async for piece in request.stream():
+            pending += piece
+            if len(pending) >= UPLOAD_COPY_BUFFER:
+                await flush()
+        if pending:
+            await flush()
+    except ClientDisconnect:
+        # Keep whatever arrived intact so the client can resume from there
+        if pending:
+            await flush()
+        logger.warning(f"Client disconnected during chunk upload for {upload_id} at {offset + written}")
+    finally:
+        session.received_bytes = offset + written
+        db.commit()
+        _resumable.remember_checksum(upload_id, session.received_bytes, digest)
+
+    return upload_session_to_dict(session)
+
+
+@router.post("/uploads/{upload_id}/finalize", response_model=_schemas.UploadJobResponse, status_code=202)
+async def finalize_upload_session(
+    upload_id: str,
+    finalize: Optional[_schemas.UploadSessionFinalize] = None,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    session = get_upload_session(db, upload_id, user.id, lock=True)
+    if session.status != "open":
+        raise HTTPException(status_code=409, detail="Upload session is already finalized")
+    if session.total_size is not None and session.received_bytes != session.total_size:
+        raise HTTPException(
+            status_code=409,
+            detail={"msg": "Upload is incomplete", "offset": session.received_bytes, "total_size": session.total_size}
+        )
+
+    digest = await run_io_bound(_resumable.checksum_state, upload_id, session.part_path, session.received_bytes)
+    content_hash = digest.hexdigest()
+    if finalize and finalize.sha256 and finalize.sha256.lower() != content_hash:
+        raise HTTPException(status_code=400, detail={"msg": "Checksum mismatch", "sha256": content_hash})
+
+    meeting_id, part_path = session.meeting_id, session.part_path
+    file_path = os.path.join(UPLOAD_DIR, f"{meeting_id}_{session.filename}")
+    await run_io_bound(_resumable.complete_upload, part_path, file_path, session.received_bytes)
+
+    # ⏳ Processing starts only now that the whole file is in place. The session
+    # is finalized in the same transaction that creates the job, so a retried
+    # finalize can never queue a second job for the same upload.
+    try:
+        job = add_upload_job(db, meeting_id, file_path, session.file_ext, content_hash)
+        session.status = "finalized"
+        session.content_hash = content_hash
+        session.job_id = job.id
+        db.commit()
+    except Exception:
+        # The session stays open: put its partial file back, before the row lock
+        # is released, so it can be resumed or finalized again
+        try:
+            os.replace(file_path, part_path)  # a rename; not queued behind a possibly full executor
+        finally:
+            db.rollback()
+        raise
+    db.refresh(job)
+    _resumable.forget_checksum(upload_id)
+
+    UploadJobQueue.enqueue(job.id)
+    logger.info(f"Queued upload job {job.id} for meeting {meeting_id} from upload {upload_id}")
+    return job_to_dict(job)
+
+
+@router.delete("/uploads/{upload_id}")
+async def abort_upload_session(
+    upload_id: str,
+    db: _orm.Session = _fastapi.Depends(get_db),
+    user: _schemas.User = _fastapi.Depends(_services.get_current_user)
+):
+    session = get_upload_session(db, upload_id, user.id, lock=True)
+    if session.status == "open" and os.path.exists(session.part_path):
+        os.remove(session.part_path)
+    _resumable.forget_checksum(upload_id)
+    db.delete(session)
+    db.commit()
+
+    return {"detail": f"Upload session {upload_id} deleted"}
 
 
 @router.get("/meetings/media_stream/{meeting_id}")